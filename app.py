@@ -1,15 +1,28 @@
 """
 Main Flask Application – Blockchain E-Voting System
 Provides RESTful API endpoints for admin and voter operations
-backed by Supabase (PostgreSQL) and a custom blockchain.
+backed by a storage backend (Supabase or local SQLite, see storage.py)
+and a custom blockchain.
 """
 
+import functools
+import hashlib
+import io
 import os
-from flask import Flask, request, jsonify, render_template
+import json
+import uuid
+from flask import Flask, Response, request, jsonify, render_template, stream_with_context, url_for
 from flask_cors import CORS
 from dotenv import load_dotenv
-from supabase import create_client, Client
-from blockchain import Blockchain
+from cache import LRUCache, SnapshotCache
+from chain_service import RemoteBlockchain, build_chain
+from events import EventBroadcaster
+from import_voters import detect_format, import_voters, iter_rows
+from metrics import Registry, TimedProxy
+from pipeline import CommitPipeline, vote_receipt
+from profiler import SamplingProfiler
+from reconcile import Reconciler
+from storage import AlreadyExists, concurrently, create_storage
 
 # ─── Configuration ────────────────────────────────────────────────────
 load_dotenv()
@@ -17,11 +30,45 @@ load_dotenv()
 app = Flask(__name__)
 CORS(app)
 
-SUPABASE_URL = os.getenv('SUPABASE_URL')
-SUPABASE_KEY = os.getenv('SUPABASE_ANON_KEY')
-
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-voting_chain = Blockchain(difficulty=4)
+# Request-stage and storage timings for /metrics; chain metrics come
+# from voting_chain.metrics_text().
+metrics = Registry()
+stage_seconds = metrics.histogram(
+    'blockvote_stage_seconds', 'Time spent in each request stage', ('endpoint', 'stage'))
+db_seconds = metrics.histogram(
+    'blockvote_db_call_seconds', 'Storage backend call latency', ('method',))
+db_errors = metrics.counter(
+    'blockvote_db_errors_total', 'Storage backend calls that raised', ('method',))
+
+db = TimedProxy(create_storage(), db_seconds, db_errors)
+profiler = SamplingProfiler(interval=float(os.getenv('PROFILER_INTERVAL', '0.01')))
+
+# With CHAIN_SERVICE_SOCKET set, every worker shares the ledger owned by
+# chain_service.py; otherwise this process builds its own chain.
+if os.getenv('CHAIN_SERVICE_SOCKET'):
+    voting_chain = RemoteBlockchain(os.getenv('CHAIN_SERVICE_SOCKET'),
+                                    pool_size=int(os.getenv('CHAIN_SERVICE_POOL_SIZE', '16')))
+else:
+    voting_chain = build_chain()
+
+# Live dashboard feed: tally deltas and new block headers from cast_vote
+events = EventBroadcaster()
+_last_published_block = None
+
+# Chain-vs-database tally checks; progress persists in RECONCILE_STATE_PATH if set
+reconciler = Reconciler(voting_chain, db, os.getenv('RECONCILE_STATE_PATH'))
+metrics.gauge('blockvote_sse_subscribers', 'Open live-results streams', lambda: events.subscribers)
+
+
+def timed_endpoint(endpoint):
+    """Record a view's total time as the `total` stage of `endpoint`."""
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            with stage_seconds.time(endpoint, 'total'):
+                return view(*args, **kwargs)
+        return wrapper
+    return decorator
 
 # ─── Page Routes ──────────────────────────────────────────────────────
 
@@ -41,7 +88,7 @@ def voter_page():
 
 @app.route('/api/admin/login', methods=['POST'])
 def admin_login():
-    """Authenticate admin via Supabase Auth."""
+    """Authenticate admin against the storage backend."""
     data = request.get_json()
     email = data.get('email')
     password = data.get('password')
@@ -50,32 +97,23 @@ def admin_login():
         return jsonify({'error': 'Email and password are required'}), 400
 
     try:
-        auth_response = supabase.auth.sign_in_with_password({
-            'email': email,
-            'password': password
-        })
-
-        user_id = auth_response.user.id
-
-        # Verify user is an admin
-        admin_check = supabase.table('admins').select('*').eq('user_id', user_id).execute()
-
-        if not admin_check.data:
-            return jsonify({'error': 'Not authorized as admin'}), 403
+        admin, access_token = db.admin_login(email, password)
 
         return jsonify({
             'message': 'Login successful',
-            'admin': admin_check.data[0],
-            'access_token': auth_response.session.access_token
+            'admin': admin,
+            'access_token': access_token
         })
 
+    except PermissionError as e:
+        return jsonify({'error': str(e)}), 403
     except Exception as e:
         return jsonify({'error': str(e)}), 401
 
 
 @app.route('/api/voter/login', methods=['POST'])
 def voter_login():
-    """Authenticate voter by voter ID."""
+    """Authenticate voter by voter ID (served from the voter cache when warm)."""
     data = request.get_json()
     voter_id = data.get('voter_id')
 
@@ -83,12 +121,11 @@ def voter_login():
         return jsonify({'error': 'Voter ID is required'}), 400
 
     try:
-        result = supabase.table('voters').select('*').eq('voter_id', voter_id).execute()
+        voter = voter_cache.load(voter_id, db.get_voter)
 
-        if not result.data:
+        if not voter:
             return jsonify({'error': 'Voter ID not found'}), 404
 
-        voter = result.data[0]
         return jsonify({
             'message': 'Login successful',
             'voter': voter
@@ -111,23 +148,45 @@ def add_voter():
         return jsonify({'error': 'voter_id, name, and email are required'}), 400
 
     try:
-        # Check if voter_id already exists
-        existing = supabase.table('voters').select('*').eq('voter_id', voter_id).execute()
-        if existing.data:
-            return jsonify({'error': 'Voter ID already exists'}), 409
-
-        result = supabase.table('voters').insert({
-            'voter_id': voter_id,
-            'name': name,
-            'email': email,
-            'has_voted': False
-        }).execute()
+        voter = db.add_voter(voter_id, name, email)
+        results_cache.invalidate()
 
         return jsonify({
             'message': 'Voter registered successfully',
-            'voter': result.data[0]
+            'voter': voter
         }), 201
 
+    except AlreadyExists:
+        return jsonify({'error': 'Voter ID already exists'}), 409
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/admin/import-voters', methods=['POST'])
+def bulk_import_voters():
+    """
+    Bulk-register voters from an uploaded CSV or NDJSON file (multipart
+    field `file`) or a raw text/csv or application/x-ndjson body.
+    Returns counts, per-row errors and rows/sec.
+    """
+    try:
+        upload = request.files.get('file')
+        if upload:
+            fmt = request.args.get('format') or detect_format(upload.filename, upload.mimetype)
+            raw = upload.stream
+        else:
+            fmt = request.args.get('format') or detect_format('', request.content_type or '')
+            raw = request.stream
+        stream = io.TextIOWrapper(raw, encoding='utf-8', newline='')
+
+        report = import_voters(db, iter_rows(stream, fmt),
+                               chunk_size=int(request.args.get('chunk_size', 1000)))
+        if report['inserted']:
+            results_cache.invalidate()
+        return jsonify(report), 200 if not report['error_count'] else 207
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -136,8 +195,7 @@ def add_voter():
 def get_voters():
     """List all registered voters."""
     try:
-        result = supabase.table('voters').select('*').order('created_at', desc=False).execute()
-        return jsonify({'voters': result.data})
+        return jsonify({'voters': db.list_voters()})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -154,22 +212,17 @@ def add_candidate():
         return jsonify({'error': 'name and party are required'}), 400
 
     try:
-        existing = supabase.table('candidates').select('*').eq('name', name).execute()
-        if existing.data:
-            return jsonify({'error': 'Candidate already exists'}), 409
-
-        result = supabase.table('candidates').insert({
-            'name': name,
-            'party': party,
-            'description': description,
-            'vote_count': 0
-        }).execute()
+        candidate = db.add_candidate(name, party, description)
+        results_cache.invalidate()
+        candidates_cache.invalidate()
 
         return jsonify({
             'message': 'Candidate added successfully',
-            'candidate': result.data[0]
+            'candidate': candidate
         }), 201
 
+    except AlreadyExists:
+        return jsonify({'error': 'Candidate already exists'}), 409
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -178,65 +231,264 @@ def add_candidate():
 def admin_get_candidates():
     """List all candidates (admin view)."""
     try:
-        result = supabase.table('candidates').select('*').order('created_at', desc=False).execute()
-        return jsonify({'candidates': result.data})
+        return jsonify({'candidates': db.list_candidates()})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+def _summarize_results(candidates, total_voters, voted_count):
+    """Build the results payload from candidate rows and turnout counts."""
+    turnout = (voted_count / total_voters * 100) if total_voters > 0 else 0
+    total_votes = sum(c.get('vote_count', 0) for c in candidates)
+
+    results = []
+    for c in candidates:
+        vote_count = c.get('vote_count', 0)
+        percentage = (vote_count / total_votes * 100) if total_votes > 0 else 0
+        results.append({
+            'name': c['name'],
+            'party': c['party'],
+            'vote_count': vote_count,
+            'percentage': round(percentage, 2)
+        })
+
+    return {
+        'results': results,
+        'stats': {
+            'total_voters': total_voters,
+            'voted': voted_count,
+            'turnout': round(turnout, 2),
+            'total_votes': total_votes
+        },
+        'blockchain': voting_chain.get_stats()
+    }
+
+
+def _load_results():
+    # The two queries are independent; run them side by side
+    candidates, counts = concurrently(db.candidate_results, db.turnout)
+    return _summarize_results(candidates, counts['total_voters'], counts['voted'])
+
+
+def _record_vote_in_results(candidate_name):
+    """Patch the cached results for one committed vote instead of reloading."""
+    def apply(snapshot):
+        candidates = [
+            {**r, 'vote_count': r['vote_count'] + (r['name'] == candidate_name)}
+            for r in snapshot['results']
+        ]
+        candidates.sort(key=lambda r: r['vote_count'], reverse=True)
+        stats = snapshot['stats']
+        return _summarize_results(candidates, stats['total_voters'], stats['voted'] + 1)
+    results_cache.update(apply)
+
+
+results_cache = SnapshotCache(_load_results, max_age=float(os.getenv('RESULTS_CACHE_MAX_AGE', '2')))
+
+
 @app.route('/api/admin/results', methods=['GET'])
+@timed_endpoint('get_results')
 def get_results():
-    """Get election results with turnout statistics."""
+    """
+    Get election results with turnout statistics. Served from a snapshot
+    that cast_vote keeps current and that is reloaded at most every
+    RESULTS_CACHE_MAX_AGE seconds.
+    """
     try:
-        candidates = supabase.table('candidates').select('*').order('vote_count', desc=True).execute()
-        voters = supabase.table('voters').select('*').execute()
-
-        total_voters = len(voters.data)
-        voted_count = sum(1 for v in voters.data if v.get('has_voted'))
-        turnout = (voted_count / total_voters * 100) if total_voters > 0 else 0
-
-        total_votes = sum(c.get('vote_count', 0) for c in candidates.data)
-
-        results = []
-        for c in candidates.data:
-            vote_count = c.get('vote_count', 0)
-            percentage = (vote_count / total_votes * 100) if total_votes > 0 else 0
-            results.append({
-                'name': c['name'],
-                'party': c['party'],
-                'vote_count': vote_count,
-                'percentage': round(percentage, 2)
-            })
+        with stage_seconds.time('get_results', 'snapshot'):
+            snapshot = results_cache.get()
+        with stage_seconds.time('get_results', 'serialize'):
+            return jsonify(snapshot)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
-        return jsonify({
-            'results': results,
-            'stats': {
-                'total_voters': total_voters,
-                'voted': voted_count,
-                'turnout': round(turnout, 2),
-                'total_votes': total_votes
-            },
-            'blockchain': voting_chain.get_stats()
-        })
 
+def _publish_vote(candidate_name, block):
+    """Push a tally delta, plus the block header the first time it is seen."""
+    global _last_published_block
+    events.publish('tally', {'candidate': candidate_name, 'delta': 1})
+    if block.hash != _last_published_block:
+        _last_published_block = block.hash
+        events.publish('block', block.to_dict(include_votes=False))
+
+
+def _resume_point(last_event_id):
+    """Parse a `<stream>-<seq>` Last-Event-ID; anything malformed resumes nowhere."""
+    if not last_event_id:
+        return None
+    stream_id, _, seq = last_event_id.strip().rpartition('-')
+    return (stream_id, int(seq)) if seq.isdigit() else ('', -1)
+
+
+@app.route('/api/admin/stream', methods=['GET'])
+def stream_results():
+    """
+    Server-Sent Events feed of `tally` deltas and new `block` headers.
+    Resumes after the Last-Event-ID header when a client reconnects,
+    or sends `reset` when this worker cannot replay from it.
+    """
+    return Response(
+        events.subscribe(_resume_point(request.headers.get('Last-Event-ID'))),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+@app.route('/api/admin/cache-stats', methods=['GET'])
+def get_cache_stats():
+    """Hit/miss metrics for the results, candidate list and voter caches."""
+    return jsonify({
+        'results': results_cache.metrics(),
+        'candidates': candidates_cache.metrics(),
+        'voters': voter_cache.metrics()
+    })
+
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Request, storage and chain metrics in Prometheus text format."""
+    return Response(metrics.render() + voting_chain.metrics_text(),
+                    mimetype='text/plain; version=0.0.4')
+
+
+@app.route('/api/admin/profiler', methods=['GET', 'POST'])
+def sampling_profiler():
+    """
+    GET returns the sampling profiler's hottest stacks. POST
+    {"action": "start", "interval": 0.005} or {"action": "stop"}
+    toggles it at runtime.
+    """
+    if request.method == 'POST':
+        data = request.get_json() or {}
+        action = data.get('action')
+        if action == 'start':
+            profiler.start(data.get('interval'))
+        elif action == 'stop':
+            profiler.stop()
+        else:
+            return jsonify({'error': 'action must be start or stop'}), 400
+    top = max(1, request.args.get('top', 50, type=int))
+    return jsonify(profiler.report(top))
+
+
+@app.route('/api/admin/reconcile', methods=['POST'])
+def reconcile_tallies():
+    """
+    Reconcile chain tallies with the votes table and candidate counters.
+    Only scans what was added since the last run unless ?full=1.
+    """
+    try:
+        full = request.args.get('full', '').lower() in ('1', 'true', 'yes')
+        return jsonify(reconciler.run(full=full))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/admin/audit', methods=['GET'])
+def audit_chain():
+    """
+    Parallel full-chain audit. Returns the first bad block index and
+    reason plus blocks/sec; ?workers= and ?segment_size= tune the pool.
+    """
+    try:
+        workers = request.args.get('workers', type=int)
+        if workers is not None:
+            workers = max(1, min(workers, os.cpu_count() or 1))
+        segment_size = request.args.get('segment_size', type=int)
+        if segment_size is not None and segment_size < 1:
+            return jsonify({'error': 'segment_size must be at least 1'}), 400
+        return jsonify(voting_chain.audit(workers, segment_size))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 # ─── Voter Operations ────────────────────────────────────────────────
 
+# commit_vote() refusal status -> (message, HTTP status)
+VOTE_COMMIT_ERRORS = {
+    'voter_not_found': ('Voter ID not found', 404),
+    'already_voted': ('You have already voted', 409),
+    'candidate_not_found': ('Candidate not found', 404)
+}
+
+def _load_candidates():
+    """Serialize the public candidate list once, with its ETag."""
+    candidates = db.public_candidates()
+    body = json.dumps({'candidates': candidates}).encode()
+    return {
+        'names': frozenset(c['name'] for c in candidates),
+        'body': body,
+        'etag': hashlib.sha1(body).hexdigest()
+    }
+
+
+# The candidate list rarely changes during an election: add_candidate
+# invalidates it, and the TTL bounds staleness across workers.
+candidates_cache = SnapshotCache(
+    _load_candidates, max_age=float(os.getenv('CANDIDATES_CACHE_MAX_AGE', '60')))
+
+# Voter records for login and the cast_vote eligibility check;
+# cast_vote marks cached voters as voted.
+voter_cache = LRUCache(
+    maxsize=int(os.getenv('VOTER_CACHE_SIZE', '100000')),
+    ttl=float(os.getenv('VOTER_CACHE_TTL', '300'))
+)
+
+
+def _mark_voted(voter_id):
+    voter_cache.update(voter_id, lambda voter: {**voter, 'has_voted': True})
+
+
+def _vote_committed(voter_id, candidate_name, block):
+    """Bring caches and dashboards up to date with a committed vote."""
+    _mark_voted(voter_id)
+    with stage_seconds.time('cast_vote', 'publish'):
+        _record_vote_in_results(candidate_name)
+        _publish_vote(candidate_name, block)
+
+
+# Accept-then-commit voting: with VOTE_ACCEPT_MODE=async (or a
+# "Prefer: respond-async" header) /api/vote stores the vote as a ticket
+# and answers 202; this pipeline mines and commits tickets in batches.
+VOTE_ACCEPT_ASYNC = os.getenv('VOTE_ACCEPT_MODE', 'sync') == 'async'
+commit_pipeline = CommitPipeline(
+    voting_chain, db, metrics,
+    batch_size=int(os.getenv('VOTE_PIPELINE_BATCH', '100')),
+    interval=float(os.getenv('VOTE_PIPELINE_INTERVAL', '0.2')),
+    lease=float(os.getenv('VOTE_TICKET_LEASE', '30')),
+    on_commit=_vote_committed
+)
+if VOTE_ACCEPT_ASYNC:
+    # Pick up tickets accepted before a restart
+    commit_pipeline.start()
+
+
 @app.route('/api/candidates', methods=['GET'])
 def get_candidates():
-    """Public endpoint to list all candidates."""
+    """
+    Public endpoint to list all candidates. Served from cache with an
+    ETag, so revalidating browsers get a 304.
+    """
     try:
-        result = supabase.table('candidates').select('id, name, party, description').execute()
-        return jsonify({'candidates': result.data})
+        snapshot = candidates_cache.get()
+        response = app.response_class(snapshot['body'], mimetype='application/json')
+        response.set_etag(snapshot['etag'])
+        response.headers['Cache-Control'] = 'no-cache'
+        return response.make_conditional(request)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
 @app.route('/api/vote', methods=['POST'])
+@timed_endpoint('cast_vote')
 def cast_vote():
-    """Cast a vote — records to both blockchain and database."""
+    """
+    Cast a vote — records to both blockchain and database.
+
+    In accept mode (VOTE_ACCEPT_MODE=async or "Prefer: respond-async")
+    the vote is validated and queued as a ticket instead: the reply is
+    202 with the ticket id and a Location to poll for the receipt. A
+    retry carrying the same Idempotency-Key gets the same ticket back.
+    """
     data = request.get_json()
     voter_id = data.get('voter_id')
     candidate_name = data.get('candidate_name')
@@ -244,61 +496,128 @@ def cast_vote():
     if not all([voter_id, candidate_name]):
         return jsonify({'error': 'voter_id and candidate_name are required'}), 400
 
+    accept_async = VOTE_ACCEPT_ASYNC or 'respond-async' in request.headers.get('Prefer', '')
+    idempotency_key = request.headers.get('Idempotency-Key') if accept_async else None
+
     try:
-        # 1. Verify voter exists and hasn't voted
-        voter_result = supabase.table('voters').select('*').eq('voter_id', voter_id).execute()
-        if not voter_result.data:
+        # 0. A retried request: answer with the ticket it already created
+        if idempotency_key:
+            ticket = db.get_ticket_by_key(idempotency_key)
+            if ticket:
+                return _ticket_accepted(ticket, voter_id, candidate_name)
+
+        # 1. Verify voter exists, hasn't voted, and candidate exists: from the
+        #    voter and candidate caches when both know the answer, otherwise
+        #    one round-trip. commit_vote re-checks atomically either way.
+        with stage_seconds.time('cast_vote', 'eligibility'):
+            voter = voter_cache.get(voter_id)
+            if voter is not None and candidate_name in candidates_cache.get()['names']:
+                eligibility = {'voter_found': True, 'has_voted': voter['has_voted'],
+                               'candidate_found': True}
+            else:
+                eligibility = db.check_vote_eligibility(voter_id, candidate_name)
+        if not eligibility['voter_found']:
             return jsonify({'error': 'Voter ID not found'}), 404
-
-        voter = voter_result.data[0]
-        if voter.get('has_voted'):
+        if eligibility['has_voted']:
             return jsonify({'error': 'You have already voted'}), 409
-
-        # 2. Verify candidate exists
-        candidate_result = supabase.table('candidates').select('*').eq('name', candidate_name).execute()
-        if not candidate_result.data:
+        if not eligibility['candidate_found']:
             return jsonify({'error': 'Candidate not found'}), 404
 
-        candidate = candidate_result.data[0]
+        if accept_async:
+            return _accept_vote(voter_id, candidate_name, idempotency_key)
 
-        # 3. Mine vote onto the blockchain
-        new_block = voting_chain.add_vote(voter_id, candidate_name)
-
-        # 4. Record vote in database
-        supabase.table('votes').insert({
-            'voter_id': voter_id,
-            'candidate_name': candidate_name,
-            'block_hash': new_block.hash,
-            'previous_hash': new_block.previous_hash,
-            'timestamp': new_block.timestamp
-        }).execute()
+        # 2. Mine vote onto the blockchain (rejects a second vote by the same voter)
+        try:
+            with stage_seconds.time('cast_vote', 'mining'):
+                new_block = voting_chain.add_vote(voter_id, candidate_name)
+        except ValueError:
+            _mark_voted(voter_id)
+            return jsonify({'error': 'You have already voted'}), 409
 
-        # 5. Update voter status
-        supabase.table('voters').update({
-            'has_voted': True
-        }).eq('voter_id', voter_id).execute()
+        # 3. Atomically record the vote, mark the voter and bump the tally
+        with stage_seconds.time('cast_vote', 'commit'):
+            commit_status = db.commit_vote(voter_id, candidate_name, new_block.hash,
+                                           new_block.previous_hash, new_block.timestamp)
+        if commit_status == 'already_voted':
+            _mark_voted(voter_id)
+        if commit_status != 'ok':
+            message, status = VOTE_COMMIT_ERRORS[commit_status]
+            return jsonify({'error': message}), status
 
-        # 6. Increment candidate vote count
-        supabase.table('candidates').update({
-            'vote_count': candidate.get('vote_count', 0) + 1
-        }).eq('name', candidate_name).execute()
+        # 4. Keep the caches and results snapshot current and notify dashboards
+        _vote_committed(voter_id, candidate_name, new_block)
 
         return jsonify({
             'message': 'Vote cast successfully!',
-            'block': new_block.to_dict(),
-            'receipt': {
-                'voter_id': voter_id,
-                'candidate': candidate_name,
-                'block_hash': new_block.hash,
-                'block_index': new_block.index,
-                'timestamp': new_block.timestamp
-            }
+            'block': new_block.to_dict(include_votes=False),
+            'receipt': vote_receipt(new_block, voter_id, candidate_name)
         }), 201
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+def _accept_vote(voter_id, candidate_name, idempotency_key):
+    """Durably queue a validated vote for the commit pipeline."""
+    with stage_seconds.time('cast_vote', 'enqueue'):
+        try:
+            ticket, _ = db.enqueue_vote(voter_id, candidate_name, idempotency_key)
+        except AlreadyExists:
+            return jsonify({'error': 'You have already voted'}), 409
+    commit_pipeline.start()
+    return _ticket_accepted(ticket, voter_id, candidate_name)
+
+
+def _ticket_accepted(ticket, voter_id, candidate_name):
+    if ticket['voter_id'] != voter_id or ticket['candidate_name'] != candidate_name:
+        return jsonify({'error': 'Idempotency-Key was already used for a different vote'}), 422
+    location = url_for('get_vote_ticket', ticket_id=ticket['id'])
+    response = jsonify({
+        'message': 'Vote accepted',
+        'ticket_id': ticket['id'],
+        'status': ticket['status'],
+        'status_url': location
+    })
+    response.status_code = 202
+    response.headers['Location'] = location
+    return response
+
+
+@app.route('/api/vote/tickets/<ticket_id>', methods=['GET'])
+def get_vote_ticket(ticket_id):
+    """
+    Status of an accepted vote: pending, committed (with the block
+    receipt) or rejected (with the reason).
+    """
+    try:
+        uuid.UUID(ticket_id)
+    except ValueError:
+        return jsonify({'error': 'Ticket not found'}), 404
+
+    try:
+        ticket = db.get_ticket(ticket_id)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    if ticket is None:
+        return jsonify({'error': 'Ticket not found'}), 404
+
+    body = {
+        'ticket_id': ticket['id'],
+        'status': ticket['status'],
+        'voter_id': ticket['voter_id'],
+        'candidate': ticket['candidate_name'],
+        'accepted_at': ticket['created_at']
+    }
+    if ticket['status'] == 'committed':
+        body['receipt'] = ticket['receipt']
+    elif ticket['status'] == 'rejected':
+        body['error'] = VOTE_COMMIT_ERRORS[ticket['error']][0]
+    response = jsonify(body)
+    if ticket['status'] == 'pending':
+        response.headers['Retry-After'] = '1'
+    return response
+
+
 @app.route('/api/verify-vote/<voter_id>', methods=['GET'])
 def verify_vote(voter_id):
     """Verify a vote exists on the blockchain."""
@@ -316,19 +635,88 @@ def verify_vote(voter_id):
 
 # ─── Blockchain ───────────────────────────────────────────────────────
 
+BLOCK_PAGE_SIZE = 20
+MAX_BLOCK_PAGE_SIZE = 500
+
+
+def _block_page(args):
+    """
+    Return one page of blocks plus the cursor for the next page.
+    `cursor` is a block index or hash (default: the first block, or the
+    tip for order=desc); `order=desc` walks back towards genesis.
+    """
+    limit = max(1, min(int(args.get('limit', BLOCK_PAGE_SIZE)), MAX_BLOCK_PAGE_SIZE))
+    descending = args.get('order', 'asc') == 'desc'
+    total = len(voting_chain)
+    cursor = args.get('cursor')
+
+    if cursor is None:
+        start = total - 1 if descending else 0
+    else:
+        start = voting_chain.block_position(cursor)
+
+    if descending:
+        low = max(0, start - limit + 1)
+        blocks = voting_chain.get_chain(low, start - low + 1)[::-1]
+        next_cursor = low - 1 if low > 0 else None
+    else:
+        blocks = voting_chain.get_chain(start, limit)
+        next_cursor = start + limit if start + limit < total else None
+
+    return {'chain': blocks, 'next_cursor': next_cursor, 'total_blocks': total}
+
+
 @app.route('/api/blockchain/validate', methods=['GET'])
 def validate_chain():
-    """Validate the entire blockchain."""
+    """
+    Validate the blockchain. Only blocks added since the last check are
+    re-hashed unless ?full=1 requests a complete audit. Returns the first
+    page of blocks (see /api/blockchain/blocks for paging parameters).
+    """
     try:
-        is_valid = voting_chain.is_chain_valid()
+        full = request.args.get('full', '').lower() in ('1', 'true', 'yes')
+        is_valid = voting_chain.is_chain_valid(full=full)
         return jsonify({
             'valid': is_valid,
             'stats': voting_chain.get_stats(),
-            'chain': voting_chain.get_chain()
+            **_block_page(request.args)
         })
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+
+@app.route('/api/blockchain/blocks', methods=['GET'])
+def get_blocks():
+    """Page through the chain: ?cursor=<index|hash>&limit=N&order=asc|desc."""
+    try:
+        return jsonify(_block_page(request.args))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/blockchain/export', methods=['GET'])
+def export_chain():
+    """Stream the chain as NDJSON, one block per line, from ?cursor= onwards."""
+    try:
+        cursor = request.args.get('cursor')
+        start = voting_chain.block_position(cursor) if cursor is not None else 0
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    def generate():
+        for block in voting_chain.iter_blocks(start):
+            yield json.dumps(block) + '\n'
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='application/x-ndjson',
+        headers={'Content-Disposition': 'attachment; filename=blockchain.ndjson'}
+    )
+
 # ─── Run ──────────────────────────────────────────────────────────────
 
 if __name__ == '__main__':
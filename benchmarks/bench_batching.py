@@ -0,0 +1,56 @@
+"""
+Vote Batching Benchmark
+Usage: python benchmarks/bench_batching.py [--difficulty N] [--votes N] [--batch-sizes 1 16 256]
+Fires concurrent add_vote() calls and reports votes/sec for
+one-block-per-vote versus Merkle batch blocks of various sizes.
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blockchain import Blockchain, verify_merkle_proof
+
+
+def bench(difficulty, votes, batch_size, interval):
+    chain = Blockchain(difficulty=difficulty, batch_size=batch_size, batch_interval=interval)
+    threads = [
+        threading.Thread(target=chain.add_vote, args=(f'V{i:06d}', 'Alice Johnson'))
+        for i in range(votes)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    assert chain.is_chain_valid()
+    assert chain.get_stats()['total_votes'] == votes
+    if batch_size > 1:
+        receipt = chain.find_vote('V000000')
+        assert verify_merkle_proof(receipt['leaf'], receipt['proof'], receipt['merkle_root'])
+    return elapsed, len(chain.chain)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--difficulty', type=int, default=4)
+    parser.add_argument('--votes', type=int, default=200)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 16, 256])
+    parser.add_argument('--interval', type=float, default=0.2)
+    args = parser.parse_args()
+
+    print(f"{args.votes} concurrent votes at difficulty {args.difficulty}")
+    print(f"{'batch':>6} {'blocks':>7} {'seconds':>9} {'votes/sec':>11}")
+    for batch_size in args.batch_sizes:
+        elapsed, blocks = bench(args.difficulty, args.votes, batch_size, args.interval)
+        print(f"{batch_size:>6} {blocks:>7} {elapsed:>9.2f} {args.votes / elapsed:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
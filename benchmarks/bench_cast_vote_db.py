@@ -0,0 +1,110 @@
+"""
+Vote Commit Database Benchmark
+Usage: python benchmarks/bench_cast_vote_db.py [--votes N] [--threads N] [--rtt-ms MS] [--dsn URL]
+Compares the old five-call vote write sequence with the
+check_vote_eligibility + commit_vote RPC pair, and checks that
+concurrent votes for one candidate no longer lose increments.
+
+Runs against a throw-away database from pg_harness.py (a local
+pgserver, or --dsn for e.g. a postgres:16 container) as the `anon`
+role, so row-level security applies as it does through PostgREST.
+--rtt-ms adds a simulated network round-trip before every call, the
+cost the RPC pair saves against a hosted database.
+
+Recorded on 1 CPU, Postgres 16 via pgserver, 200 votes, 16 clients:
+
+  rtt 0ms   legacy p50 31.7ms  401 votes/sec  vote_count  19/200
+            rpc    p50 21.8ms  499 votes/sec  vote_count 200/200
+  rtt 20ms  legacy p50 106.8ms 131 votes/sec  vote_count  14/200
+            rpc    p50 43.0ms  320 votes/sec  vote_count 200/200
+"""
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from pg_harness import PostgresHarness, add_voters, commit_params, rpc
+
+
+def legacy_vote(conn, voter_id, candidate_name, hop):
+    """The original cast_vote sequence: five round-trips."""
+    hop()
+    conn.execute('SELECT * FROM voters WHERE voter_id = %s', (voter_id,)).fetchone()
+    hop()
+    candidate = conn.execute('SELECT * FROM candidates WHERE name = %s', (candidate_name,)).fetchone()
+    hop()
+    conn.execute(
+        'INSERT INTO votes (voter_id, candidate_name, block_hash, previous_hash, timestamp) '
+        'VALUES (%s, %s, %s, %s, %s)',
+        (voter_id, candidate_name, uuid.uuid4().hex, uuid.uuid4().hex, time.time()))
+    hop()
+    conn.execute('UPDATE voters SET has_voted = TRUE WHERE voter_id = %s', (voter_id,))
+    hop()
+    conn.execute('UPDATE candidates SET vote_count = %s WHERE name = %s',
+                 (candidate['vote_count'] + 1, candidate_name))
+
+
+def rpc_vote(conn, voter_id, candidate_name, hop):
+    """The current cast_vote sequence: two RPC round-trips."""
+    hop()
+    rpc(conn, 'check_vote_eligibility', p_voter_id=voter_id, p_candidate_name=candidate_name)
+    hop()
+    result = rpc(conn, 'commit_vote', **commit_params(voter_id, candidate_name))
+    assert result['status'] == 'ok', result
+
+
+def run(harness, label, vote, votes, threads, rtt):
+    run_id = uuid.uuid4().hex[:8]
+    candidate = f'Bench {label} {run_id}'
+    voters = [f'B{run_id}-{i:05d}' for i in range(votes)]
+    with harness.connect() as conn:
+        conn.execute("INSERT INTO candidates (name, party) VALUES (%s, 'Benchmark')", (candidate,))
+        add_voters(conn, voters)
+
+    local = threading.local()
+
+    def hop():
+        if rtt:
+            time.sleep(rtt)
+
+    def timed(voter_id):
+        if not hasattr(local, 'conn'):
+            local.conn = harness.connect()
+        start = time.perf_counter()
+        vote(local.conn, voter_id, candidate, hop)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        latencies = sorted(pool.map(timed, voters))
+    elapsed = time.perf_counter() - start
+
+    with harness.connect() as conn:
+        final = conn.execute('SELECT vote_count FROM candidates WHERE name = %s', (candidate,)).fetchone()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"  {label:<7} p50 {statistics.median(latencies) * 1000:7.1f}ms  "
+          f"p95 {p95 * 1000:7.1f}ms  {votes / elapsed:8.1f} votes/sec  "
+          f"vote_count {final['vote_count']}/{votes}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--votes', type=int, default=200)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--rtt-ms', type=float, default=0, help='simulated round-trip per call')
+    parser.add_argument('--dsn', help='Postgres server for the throw-away database (default: pgserver)')
+    args = parser.parse_args()
+
+    with PostgresHarness(args.dsn) as harness:
+        print(f"{args.votes} votes, {args.threads} concurrent clients, "
+              f"{args.rtt_ms:g}ms simulated round-trip", file=sys.stderr)
+        run(harness, 'legacy', legacy_vote, args.votes, args.threads, args.rtt_ms / 1000)
+        run(harness, 'rpc', rpc_vote, args.votes, args.threads, args.rtt_ms / 1000)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+"""
+Data-Layer Worker Benchmark
+Usage:
+  python benchmarks/bench_data_layer.py [--latency-ms 20] [--requests 300] [--concurrency 32]
+Compares the sync worker setup with the gevent worker over the pooled
+keep-alive Supabase client, without a real Supabase project:
+
+  1. A local stand-in PostgREST server answers the calls behind
+     /api/vote, /api/verify-vote and /api/admin/results with canned rows
+     after --latency-ms, like a remote database round-trip.
+  2. The app is served by gunicorn with the sync worker, then with the
+     gevent worker, each pointed at the stand-in with SUPABASE_URL.
+  3. The same concurrent load runs against both.
+
+Prints p50/p95 latency and throughput per endpoint and worker as JSON.
+The stand-in speaks plain HTTP/1.1, so this measures connection reuse
+and cooperative waiting; HTTP/2 is only negotiated over TLS.
+"""
+
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(ROOT))
+sys.path.insert(0, ROOT)
+
+from suite import CANDIDATES, http_json, load, report, summarize
+
+WORKERS = ('sync', 'gevent')
+
+
+# ─── Stand-in PostgREST ───────────────────────────────────────────────
+
+def serve_standin(port, latency):
+    """Serve canned PostgREST responses after `latency` seconds (runs in a subprocess)."""
+    from gevent import monkey
+    monkey.patch_all()
+    import gevent
+    from gevent.pywsgi import WSGIServer
+
+    voted = set()
+    responses = {
+        '/rest/v1/rpc/check_vote_eligibility': lambda body: {
+            'voter_found': True, 'has_voted': body['p_voter_id'] in voted, 'candidate_found': True
+        },
+        '/rest/v1/rpc/commit_vote': lambda body: (voted.add(body['p_voter_id']), {'status': 'ok'})[1],
+        '/rest/v1/rpc/election_turnout': lambda body: {'total_voters': 100000, 'voted': len(voted)},
+        '/rest/v1/candidates': lambda body: [
+            {'name': name, 'party': 'Bench', 'vote_count': 0, 'id': i, 'description': ''}
+            for i, name in enumerate(CANDIDATES)
+        ]
+    }
+
+    def application(environ, start_response):
+        gevent.sleep(latency)
+        respond = responses.get(environ['PATH_INFO'])
+        if respond is None:
+            start_response('404 Not Found', [('Content-Type', 'application/json')])
+            return [b'{"message": "not found"}']
+        length = int(environ.get('CONTENT_LENGTH') or 0)
+        body = json.loads(environ['wsgi.input'].read(length) or b'{}')
+        payload = json.dumps(respond(body)).encode()
+        start_response('200 OK', [('Content-Type', 'application/json'),
+                                  ('Content-Length', str(len(payload)))])
+        return [payload]
+
+    # Without TCP_NODELAY every response would stall on delayed ACKs
+    listener = socket.socket()
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    listener.bind(('127.0.0.1', port))
+    listener.listen(1024)
+    WSGIServer(listener, application, log=None).serve_forever()
+
+
+# ─── App under gunicorn ───────────────────────────────────────────────
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_until_up(url, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            return
+        except urllib.error.HTTPError:
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f'{url} did not come up')
+
+
+def start_app(worker, standin_url, args):
+    port = free_port()
+    env = {
+        **os.environ,
+        'STORAGE_BACKEND': 'supabase',
+        'SUPABASE_URL': standin_url,
+        'SUPABASE_ANON_KEY': 'bench.anon.key',
+        'DB_POOL_SIZE': str(args.pool_size),
+        'MINING_DIFFICULTY': str(args.difficulty),
+        'RESULTS_CACHE_MAX_AGE': '0',
+        'CHAIN_DATA_DIR': tempfile.mkdtemp(prefix=f'blockvote-{worker}-')
+    }
+    env.pop('CHAIN_SERVICE_SOCKET', None)
+    command = [sys.executable, '-m', 'gunicorn', 'app:app', '--worker-class', worker,
+               '--workers', '1', '--bind', f'127.0.0.1:{port}', '--log-level', 'warning']
+    if worker == 'gevent':
+        command += ['--worker-connections', '1000']
+    process = subprocess.Popen(command, cwd=os.path.dirname(ROOT), env=env)
+    url = f'http://127.0.0.1:{port}'
+    wait_until_up(f'{url}/api/candidates')
+    return process, url
+
+
+def bench_worker(worker, standin_url, args):
+    process, url = start_app(worker, standin_url, args)
+    voter_ids = [f'{worker[0].upper()}{i:06d}' for i in range(args.requests)]
+    phases = [
+        ('vote', [(http_json, f'{url}/api/vote', {'voter_id': v, 'candidate_name': CANDIDATES[i % 3]})
+                  for i, v in enumerate(voter_ids)]),
+        ('verify_vote', [(http_json, f'{url}/api/verify-vote/{random.choice(voter_ids)}')
+                         for _ in range(args.requests)]),
+        ('results', [(http_json, f'{url}/api/admin/results') for _ in range(args.requests)])
+    ]
+    results = {}
+    try:
+        for name, calls in phases:
+            latencies, statuses, elapsed = load(args.concurrency, calls)
+            key = f'{worker}/{name}'
+            results[key] = {**summarize(latencies, elapsed), 'status_codes': statuses}
+            report(key, results)
+    finally:
+        process.terminate()
+        process.wait()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare sync and gevent workers against a stand-in database.')
+    parser.add_argument('--latency-ms', type=float, default=20, help='stand-in round-trip latency')
+    parser.add_argument('--requests', type=int, default=300, help='requests per endpoint')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--pool-size', type=int, default=20)
+    parser.add_argument('--difficulty', type=int, default=1)
+    parser.add_argument('--workers', nargs='*', choices=WORKERS, default=list(WORKERS))
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--serve-standin', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve_standin:
+        serve_standin(args.serve_standin, args.latency_ms / 1000)
+        return
+    random.seed(args.seed)
+
+    standin_port = free_port()
+    standin = subprocess.Popen([sys.executable, os.path.abspath(__file__),
+                                '--serve-standin', str(standin_port),
+                                '--latency-ms', str(args.latency_ms)])
+    standin_url = f'http://127.0.0.1:{standin_port}'
+    results = {}
+    try:
+        wait_until_up(f'{standin_url}/rest/v1/candidates')
+        for worker in args.workers:
+            results.update(bench_worker(worker, standin_url, args))
+    finally:
+        standin.terminate()
+        standin.wait()
+
+    if set(WORKERS) <= set(args.workers):
+        print('\nThroughput gevent vs sync:', file=sys.stderr)
+        for name in ('vote', 'verify_vote', 'results'):
+            before = results[f'sync/{name}']['throughput_per_sec']
+            after = results[f'gevent/{name}']['throughput_per_sec']
+            print(f'  {name:<42} {after / before:>6.2f}x', file=sys.stderr)
+
+    print(json.dumps({'meta': {'args': vars(args), 'cpu_count': os.cpu_count()},
+                      'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Vote Lookup Benchmark
+Usage: python benchmarks/bench_find_vote.py [--votes N] [--batch-size N]
+Builds a chain, checks that the voter index agrees with a full linear
+scan for every voter, then compares indexed and scanning lookup times.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blockchain import Blockchain
+
+
+def scan(chain, voter_id):
+    """Reference lookup: walk every block, as find_vote used to."""
+    for block in chain.chain:
+        if voter_id in block.voter_ids():
+            return block.index
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--votes', type=int, default=5000)
+    parser.add_argument('--batch-size', type=int, default=1)
+    args = parser.parse_args()
+
+    chain = Blockchain(difficulty=0)
+    if args.batch_size > 1:
+        chain.batch_size, chain.batch_interval = args.batch_size, 0
+    for i in range(args.votes):
+        chain.add_vote(f'V{i:07d}', 'Alice Johnson')
+
+    voter_ids = [f'V{i:07d}' for i in range(args.votes)] + ['MISSING']
+    for voter_id in voter_ids:
+        found = chain.find_vote(voter_id)
+        assert (found and found['index']) == scan(chain, voter_id), voter_id
+
+    restored = Blockchain(difficulty=0)
+    restored.load_chain(chain.get_chain())
+    assert restored._vote_index == chain._vote_index
+    print(f"  ✓ index agrees with full scan for {len(voter_ids):,} lookups")
+
+    sample = voter_ids[-1000:]
+    start = time.perf_counter()
+    for voter_id in sample:
+        scan(chain, voter_id)
+    scan_time = (time.perf_counter() - start) / len(sample)
+    start = time.perf_counter()
+    for voter_id in sample:
+        chain.find_vote(voter_id)
+    index_time = (time.perf_counter() - start) / len(sample)
+    print(f"  scan  {scan_time * 1e6:10.1f} µs/lookup")
+    print(f"  index {index_time * 1e6:10.1f} µs/lookup")
+
+
+if __name__ == '__main__':
+    main()
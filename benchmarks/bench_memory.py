@@ -0,0 +1,104 @@
+"""
+Block Memory Benchmark
+Usage: python benchmarks/bench_memory.py [--blocks N]
+Measures memory held per vote block for the original dict-backed Block
+layout versus the current slotted Block with raw digests and interned
+strings, extrapolated to one million blocks, and checks the two produce
+byte-identical hashes. The `chained` row is the slotted Block as a
+Blockchain holds it: attached to the chain and in its vote and hash
+indexes, which is what the app pays per block.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blockchain import Block, Blockchain
+
+CANDIDATES = ['Alice Johnson', 'Bob Williams', 'Carol Martinez', 'David Chen', 'Eva Rodriguez']
+
+
+class LegacyBlock:
+    """The original Block layout: per-instance __dict__, hex hash strings."""
+
+    def __init__(self, index, timestamp, data, previous_hash, nonce=0):
+        self.index = index
+        self.timestamp = timestamp
+        self.data = data
+        self.previous_hash = previous_hash
+        self.nonce = nonce
+        self.hash = self.calculate_hash()
+
+    def calculate_hash(self):
+        block_string = json.dumps({
+            'index': self.index,
+            'timestamp': self.timestamp,
+            'data': self.data,
+            'previous_hash': self.previous_hash,
+            'nonce': self.nonce
+        }, sort_keys=True)
+        return hashlib.sha256(block_string.encode()).hexdigest()
+
+
+def vote(i):
+    # Candidate names arrive as fresh strings per request, as from JSON
+    return {
+        'type': 'vote',
+        'voter_id': f'V{i:07d}',
+        'candidate': ''.join(CANDIDATES[i % len(CANDIDATES)]),
+        'timestamp': 1700000000.0 + i
+    }
+
+
+def measure(cls, count):
+    tracemalloc.start()
+    blocks = []
+    previous = '0' * 64
+    for i in range(count):
+        block = cls(i, 1700000000.5 + i, json.loads(json.dumps(vote(i))), previous)
+        previous = block.hash
+        blocks.append(block)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return blocks, current / count
+
+
+def measure_chained(count):
+    chain = Blockchain(difficulty=1)
+    previous = chain.get_latest_block().hash
+    tracemalloc.start()
+    for i in range(1, count + 1):
+        block = Block(i, 1700000000.5 + i, json.loads(json.dumps(vote(i))), previous)
+        previous = block.hash
+        chain._append_block(block)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return chain, current / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--blocks', type=int, default=100_000)
+    args = parser.parse_args()
+
+    legacy, legacy_bytes = measure(LegacyBlock, args.blocks)
+    compact, compact_bytes = measure(Block, args.blocks)
+    assert all(a.hash == b.hash == b.calculate_hash() for a, b in zip(legacy, compact))
+    del compact
+    _, chained_bytes = measure_chained(args.blocks)
+
+    print(f"  {'layout':<8} {'bytes/block':>12} {'MB per 1M blocks':>17}")
+    for label, size in (('legacy', legacy_bytes), ('compact', compact_bytes),
+                        ('chained', chained_bytes)):
+        print(f"  {label:<8} {size:>12,.0f} {size * 1_000_000 / 2 ** 20:>17,.0f}")
+    print(f"  ✓ identical hashes, {1 - compact_bytes / legacy_bytes:.0%} less memory "
+          f"({1 - chained_bytes / legacy_bytes:.0%} once held by a Blockchain)")
+
+
+if __name__ == '__main__':
+    main()
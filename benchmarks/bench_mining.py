@@ -0,0 +1,73 @@
+"""
+Mining Micro-Benchmark
+Usage: python benchmarks/bench_mining.py [--difficulty N] [--blocks N]
+Compares the legacy calculate_hash() nonce loop with the
+precomputed-prefix engine in Block.mine_block and reports hashes/sec.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blockchain import Block
+
+
+def legacy_mine(block, difficulty):
+    """The original mining loop: full JSON + SHA-256 per nonce."""
+    target = '0' * difficulty
+    while block.hash[:difficulty] != target:
+        block.nonce += 1
+        block.hash = block.calculate_hash()
+    return block.hash
+
+
+def make_block(i):
+    data = {
+        'type': 'vote',
+        'voter_id': f'V{i:06d}',
+        'candidate': 'Alice Johnson',
+        'timestamp': 1700000000.0 + i
+    }
+    return Block(i + 1, 1700000000.5 + i, data, '0' * 64)
+
+
+def run(label, mine, difficulty, blocks):
+    attempts = 0
+    start = time.perf_counter()
+    results = []
+    for i in range(blocks):
+        block = make_block(i)
+        mine(block, difficulty)
+        attempts += block.nonce + 1
+        results.append((block.nonce, block.hash))
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<10} {attempts:>10,} hashes  {elapsed:8.3f}s  "
+          f"{attempts / elapsed:>12,.0f} hashes/sec")
+    return results, attempts / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--difficulty', type=int, default=4)
+    parser.add_argument('--blocks', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"Mining {args.blocks} blocks at difficulty {args.difficulty}")
+    before, before_rate = run('legacy', legacy_mine, args.difficulty, args.blocks)
+    after, after_rate = run('prefix', lambda b, d: b.mine_block(d), args.difficulty, args.blocks)
+
+    if before != after:
+        print("  ✗ nonce/hash mismatch between engines")
+        sys.exit(1)
+    for i, (nonce, digest) in enumerate(after):
+        block = make_block(i)
+        block.nonce = nonce
+        assert block.calculate_hash() == digest
+    print(f"  ✓ identical hashes, speedup {after_rate / before_rate:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
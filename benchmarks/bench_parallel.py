@@ -0,0 +1,44 @@
+"""
+Parallel Mining Benchmark
+Usage: python benchmarks/bench_parallel.py [--difficulties 4 5 6] [--max-workers N] [--votes N]
+Reports per-vote mining latency for each difficulty across 1..N worker
+processes and checks every resulting chain with is_chain_valid().
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blockchain import Blockchain
+
+
+def bench(difficulty, workers, votes):
+    chain = Blockchain(difficulty=difficulty, workers=workers)
+    latencies = []
+    for i in range(votes):
+        start = time.perf_counter()
+        chain.add_vote(f'V{i:06d}', 'Alice Johnson')
+        latencies.append(time.perf_counter() - start)
+    assert chain.is_chain_valid(), 'parallel-mined chain failed validation'
+    return sum(latencies) / len(latencies), max(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--difficulties', type=int, nargs='+', default=[4, 5, 6])
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--votes', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'difficulty':>10} {'workers':>8} {'mean s/vote':>12} {'max s/vote':>11}")
+    for difficulty in args.difficulties:
+        for workers in range(1, args.max_workers + 1):
+            mean, worst = bench(difficulty, workers, args.votes)
+            print(f"{difficulty:>10} {workers:>8} {mean:>12.3f} {worst:>11.3f}")
+
+
+if __name__ == '__main__':
+    main()
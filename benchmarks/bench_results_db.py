@@ -0,0 +1,80 @@
+"""
+Results Query Benchmark
+Usage: python benchmarks/bench_results_db.py [--seed N] [--runs N]
+Compares the old results queries (every voter row, counted in Python)
+with the election_turnout() aggregate and narrow candidate projection
+used by /api/admin/results, reporting latency and bytes transferred.
+
+Run it against a local Supabase stack with supabase_setup.sql applied;
+--seed registers N throw-away voters first to build a large dataset.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+import uuid
+
+from dotenv import load_dotenv
+from supabase import create_client
+
+
+def legacy_results(db):
+    candidates = db.table('candidates').select('*').order('vote_count', desc=True).execute()
+    voters = db.table('voters').select('*').execute()
+    counts = (len(voters.data), sum(1 for v in voters.data if v.get('has_voted')))
+    return counts, len(json.dumps(candidates.data)) + len(json.dumps(voters.data))
+
+
+def aggregate_results(db):
+    candidates = db.table('candidates').select('name, party, vote_count') \
+        .order('vote_count', desc=True).execute()
+    turnout = db.rpc('election_turnout', {}).execute().data
+    counts = (turnout['total_voters'], turnout['voted'])
+    return counts, len(json.dumps(candidates.data)) + len(json.dumps(turnout))
+
+
+def seed(db, count, chunk=1000):
+    run_id = uuid.uuid4().hex[:8]
+    for offset in range(0, count, chunk):
+        db.table('voters').insert([
+            {'voter_id': f'R{run_id}-{i:07d}', 'name': f'Bench Voter {i}',
+             'email': f'r{i}@bench.invalid', 'has_voted': i % 3 == 0}
+            for i in range(offset, min(offset + chunk, count))
+        ]).execute()
+
+
+def bench(label, query, db, runs):
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        counts, size = query(db)
+        latencies.append(time.perf_counter() - start)
+    print(f"  {label:<10} median {statistics.median(latencies) * 1000:9.1f}ms  "
+          f"{size:>12,} bytes  voters/voted {counts}")
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    load_dotenv()
+    db = create_client(os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_ANON_KEY'))
+    if args.seed:
+        print(f"Seeding {args.seed:,} voters...")
+        seed(db, args.seed)
+
+    before = bench('legacy', legacy_results, db, args.runs)
+    after = bench('aggregate', aggregate_results, db, args.runs)
+    # PostgREST caps un-ranged selects (max-rows), so the legacy count
+    # can undercount on very large tables.
+    if before != after:
+        print("  ! counts differ — legacy query was truncated by the row limit")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Chain Store Restart Benchmark
+Usage: python benchmarks/bench_store.py [--sizes 10000 100000 1000000] [--dir PATH]
+Writes chains of the given sizes through ChainStore, then measures how
+long a restart takes to rebuild the in-memory chain and voter index.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blockchain import Block, Blockchain
+from chain_store import ChainStore
+
+
+def write_chain(directory, size):
+    """Write `size` blocks (difficulty 0, so no mining) straight to the store."""
+    store = ChainStore(directory, fsync='never', checkpoint_every=size)
+    previous = Block(0, 1700000000.0, {'type': 'genesis', 'message': 'Genesis Block'}, '0')
+    store.append(previous)
+    for i in range(1, size):
+        block = Block(i, 1700000000.0 + i, {
+            'type': 'vote',
+            'voter_id': f'V{i:07d}',
+            'candidate': 'Alice Johnson',
+            'timestamp': 1700000000.0 + i
+        }, previous.hash)
+        store.append(block)
+        previous = block
+    store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--dir', default=None, help='scratch directory (default: a temp dir)')
+    args = parser.parse_args()
+
+    root = args.dir or tempfile.mkdtemp(prefix='chain-store-bench-')
+    print(f"{'blocks':>10} {'checkpointed':>14} {'no checkpoint':>14}")
+    try:
+        for size in args.sizes:
+            directory = os.path.join(root, str(size))
+            write_chain(directory, size)
+
+            start = time.perf_counter()
+            chain = Blockchain(difficulty=0, store=ChainStore(directory))
+            with_checkpoint = time.perf_counter() - start
+            assert len(chain.chain) == size and chain.find_vote(f'V{size - 1:07d}')
+            chain.store.close()
+
+            os.remove(os.path.join(directory, 'checkpoint.json'))
+            start = time.perf_counter()
+            chain = Blockchain(difficulty=0, store=ChainStore(directory))
+            without_checkpoint = time.perf_counter() - start
+            chain.store.close()
+
+            print(f"{size:>10,} {with_checkpoint:>13.2f}s {without_checkpoint:>13.2f}s")
+            shutil.rmtree(directory)
+    finally:
+        if args.dir is None:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
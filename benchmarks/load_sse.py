@@ -0,0 +1,83 @@
+"""
+Live Results Stream Load Test
+Usage: python benchmarks/load_sse.py [--subscribers N] [--events N] [--rate N]
+Serves the app under gevent's WSGI server (as the gevent gunicorn worker
+does), connects N concurrent /api/admin/stream subscribers, publishes
+tally events and reports delivery latency and the OS thread count.
+"""
+
+from gevent import monkey
+monkey.patch_all()
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+import gevent
+from gevent import socket
+from gevent.pywsgi import WSGIServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as voting_app
+
+
+def subscriber(port, expected, latencies, ready):
+    sock = socket.create_connection(('127.0.0.1', port))
+    sock.sendall(b'GET /api/admin/stream HTTP/1.1\r\nHost: localhost\r\n\r\n')
+    reader = sock.makefile('rb')
+    ready.append(1)
+    received = 0
+    while received < expected:
+        line = reader.readline()
+        if not line:
+            break
+        if line.startswith(b'data: {"candidate"'):
+            sent_at = float(line.split(b'"sent_at": ')[1].rstrip(b'}\r\n'))
+            latencies.append(time.perf_counter() - sent_at)
+            received += 1
+    sock.close()
+    return received
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--subscribers', type=int, default=500)
+    parser.add_argument('--events', type=int, default=50)
+    parser.add_argument('--rate', type=float, default=100, help='events per second')
+    args = parser.parse_args()
+
+    server = WSGIServer(('127.0.0.1', 0), voting_app.app, log=None)
+    server.start()
+    port = server.server_port
+
+    latencies, ready = [], []
+    clients = [gevent.spawn(subscriber, port, args.events, latencies, ready)
+               for _ in range(args.subscribers)]
+    while len(ready) < args.subscribers or voting_app.events.subscribers < args.subscribers:
+        gevent.sleep(0.05)
+
+    start = time.perf_counter()
+    for _ in range(args.events):
+        voting_app.events.publish('tally', {
+            'candidate': 'Alice Johnson', 'delta': 1, 'sent_at': time.perf_counter()
+        })
+        gevent.sleep(1 / args.rate)
+    gevent.joinall(clients, timeout=30)
+    elapsed = time.perf_counter() - start
+
+    delivered = sum(c.value or 0 for c in clients)
+    latencies.sort()
+    print(f"  {args.subscribers} subscribers × {args.events} events "
+          f"= {delivered:,}/{args.subscribers * args.events:,} delivered in {elapsed:.2f}s")
+    print(f"  latency p50 {statistics.median(latencies) * 1000:.1f}ms  "
+          f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:.1f}ms")
+    print(f"  OS threads in process: {threading.active_count()}")
+    server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,245 @@
+"""
+Disposable Postgres Harness
+Usage:
+  python benchmarks/pg_harness.py [--dsn URL]
+Loads supabase_setup.sql into a throw-away Postgres database and calls
+every vote function as the `anon` role, the way PostgREST runs them for
+the app, so the SQL and its row-level security policies are exercised
+without a Supabase project. Exits non-zero on the first failed check.
+
+The server comes from --dsn / $PG_HARNESS_DSN, for example a container:
+  docker run --rm -e POSTGRES_PASSWORD=pg -p 55432:5432 postgres:16
+  python benchmarks/pg_harness.py --dsn postgresql://postgres:pg@127.0.0.1:55432/postgres
+or, with no DSN, a temporary local server from the `pgserver` package
+(pip install pgserver "psycopg[binary]"). Each run creates and drops its
+own database; the Supabase roles and auth.users are stubbed.
+
+bench_cast_vote_db.py uses the same harness for its measurements.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import psycopg
+from psycopg.rows import dict_row
+from psycopg.types.json import Json
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What a Supabase project provides before supabase_setup.sql runs: the
+# API roles, table and function grants for them, and auth.users.
+SUPABASE_STUB = '''
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'anon') THEN
+        CREATE ROLE anon NOLOGIN;
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'authenticated') THEN
+        CREATE ROLE authenticated NOLOGIN;
+    END IF;
+END
+$$;
+CREATE SCHEMA IF NOT EXISTS auth;
+CREATE TABLE IF NOT EXISTS auth.users (id UUID PRIMARY KEY);
+GRANT USAGE ON SCHEMA public TO anon, authenticated;
+GRANT anon, authenticated TO CURRENT_USER;
+ALTER DEFAULT PRIVILEGES IN SCHEMA public GRANT ALL ON TABLES TO anon, authenticated;
+ALTER DEFAULT PRIVILEGES IN SCHEMA public GRANT ALL ON SEQUENCES TO anon, authenticated;
+ALTER DEFAULT PRIVILEGES IN SCHEMA public GRANT EXECUTE ON FUNCTIONS TO anon, authenticated;
+'''
+
+# Servers built without uuid-ossp (pgserver) get the one function the
+# schema uses from the built-in generator instead.
+UUID_OSSP = 'CREATE EXTENSION IF NOT EXISTS "uuid-ossp";'
+UUID_FALLBACK = 'CREATE OR REPLACE FUNCTION uuid_generate_v4() RETURNS UUID LANGUAGE sql AS $$ SELECT gen_random_uuid() $$;'
+
+
+class PostgresHarness:
+    """A fresh database with supabase_setup.sql applied, dropped on exit."""
+
+    def __init__(self, dsn=None):
+        self.dsn = dsn or os.getenv('PG_HARNESS_DSN')
+        self._server = None
+        self._admin = None
+        self.dbname = f'blockvote_{uuid.uuid4().hex[:8]}'
+
+    def __enter__(self):
+        if not self.dsn:
+            import pgserver
+            self._server = pgserver.get_server(tempfile.mkdtemp(prefix='blockvote-pg-'),
+                                               cleanup_mode='delete')
+            self.dsn = self._server.get_uri()
+        self._admin = psycopg.connect(self.dsn, autocommit=True)
+        self._admin.execute(f'CREATE DATABASE {self.dbname}')
+        with open(os.path.join(ROOT, 'supabase_setup.sql'), encoding='utf-8') as f:
+            schema = f.read()
+        with self.connect(role=None) as conn:
+            conn.execute(SUPABASE_STUB)
+            if not conn.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'uuid-ossp'").fetchone():
+                schema = schema.replace(UUID_OSSP, UUID_FALLBACK)
+            conn.execute(schema)
+        return self
+
+    def __exit__(self, *exc):
+        self._admin.execute(f'DROP DATABASE IF EXISTS {self.dbname} WITH (FORCE)')
+        self._admin.close()
+        if self._server is not None:
+            self._server.cleanup()
+
+    def connect(self, role='anon'):
+        """Autocommit connection to the harness database, as `role` (None: owner)."""
+        conn = psycopg.connect(self.dsn, dbname=self.dbname, autocommit=True, row_factory=dict_row)
+        if role:
+            conn.execute(f'SET ROLE {role}')
+        return conn
+
+
+def _call_sql(function, params):
+    args = ', '.join(f'{name} => %({name})s' for name in params)
+    values = {k: Json(v) if isinstance(v, (dict, list)) else v for k, v in params.items()}
+    return f'{function}({args})', values
+
+
+def rpc(conn, function, **params):
+    """Call a function returning one value, as PostgREST's /rpc does."""
+    call, values = _call_sql(function, params)
+    return conn.execute(f'SELECT {call} AS result', values).fetchone()['result']
+
+
+def rpc_rows(conn, function, **params):
+    """Call a set-returning function; returns its rows as dicts."""
+    call, values = _call_sql(function, params)
+    return conn.execute(f'SELECT * FROM {call}', values).fetchall()
+
+
+def add_voters(conn, voter_ids):
+    with conn.cursor() as cur:
+        cur.executemany(
+            'INSERT INTO voters (voter_id, name, email) VALUES (%s, %s, %s)',
+            [(v, v, f'{v}@harness.invalid') for v in voter_ids])
+
+
+def commit_params(voter_id, candidate_name):
+    return {
+        'p_voter_id': voter_id,
+        'p_candidate_name': candidate_name,
+        'p_block_hash': uuid.uuid4().hex,
+        'p_previous_hash': uuid.uuid4().hex,
+        'p_timestamp': time.time()
+    }
+
+
+# ─── Checks ───────────────────────────────────────────────────────────
+
+def check(name, condition, detail=''):
+    if not condition:
+        raise AssertionError(f'{name}: {detail}')
+    print(f'  ok  {name}', file=sys.stderr)
+
+
+def check_votes(harness):
+    """check_vote_eligibility, commit_vote, election_turnout and vote_tallies as anon."""
+    with harness.connect() as conn:
+        conn.execute("INSERT INTO candidates (name, party) VALUES ('Alice', 'A'), ('Bob', 'B')")
+        add_voters(conn, ['V1', 'V2', 'V3'])
+
+        eligibility = rpc(conn, 'check_vote_eligibility', p_voter_id='V1', p_candidate_name='Alice')
+        check('eligibility', eligibility == {'voter_found': True, 'has_voted': False,
+                                             'candidate_found': True}, eligibility)
+        status = rpc(conn, 'commit_vote', **commit_params('V1', 'Alice'))
+        check('commit_vote ok', status == {'status': 'ok'}, status)
+        status = rpc(conn, 'commit_vote', **commit_params('V1', 'Alice'))
+        check('commit_vote already_voted', status == {'status': 'already_voted'}, status)
+        status = rpc(conn, 'commit_vote', **commit_params('NOPE', 'Alice'))
+        check('commit_vote voter_not_found', status == {'status': 'voter_not_found'}, status)
+        status = rpc(conn, 'commit_vote', **commit_params('V2', 'Nobody'))
+        check('commit_vote candidate_not_found', status == {'status': 'candidate_not_found'}, status)
+        voter = conn.execute("SELECT has_voted FROM voters WHERE voter_id = 'V2'").fetchone()
+        check('refused vote writes nothing', voter['has_voted'] is False, voter)
+
+        turnout = rpc(conn, 'election_turnout')
+        check('election_turnout', turnout == {'total_voters': 3, 'voted': 1}, turnout)
+        tallies = rpc(conn, 'vote_tallies')
+        check('vote_tallies', tallies == {'Alice': 1}, tallies)
+
+    # Concurrent commits for one candidate must not lose increments
+    voters = [f'C{i:04d}' for i in range(200)]
+    with harness.connect() as conn:
+        add_voters(conn, voters)
+    local = threading.local()
+
+    def vote(voter_id):
+        if not hasattr(local, 'conn'):
+            local.conn = harness.connect()
+        return rpc(local.conn, 'commit_vote', **commit_params(voter_id, 'Bob'))['status']
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        statuses = list(pool.map(vote, voters))
+    with harness.connect() as conn:
+        count = conn.execute("SELECT vote_count FROM candidates WHERE name = 'Bob'").fetchone()
+    check('concurrent commit_vote keeps every increment',
+          statuses.count('ok') == len(voters) and count['vote_count'] == len(voters), count)
+
+
+def check_tickets(harness):
+    """The vote_tickets queue behind accept-then-commit voting, as anon."""
+    with harness.connect() as conn:
+        conn.execute("INSERT INTO candidates (name, party) VALUES ('Carol', 'C')")
+        add_voters(conn, [f'T{i}' for i in range(4)])
+        for i in range(4):
+            conn.execute("INSERT INTO vote_tickets (voter_id, candidate_name, idempotency_key) "
+                         "VALUES (%s, 'Carol', %s)", (f'T{i}', f'key-{i}'))
+
+        claimed = rpc_rows(conn, 'claim_vote_tickets', p_limit=3, p_lease_seconds=30)
+        check('claim_vote_tickets leases the oldest tickets',
+              [t['voter_id'] for t in claimed] == ['T0', 'T1', 'T2']
+              and all(t['attempts'] == 1 for t in claimed), claimed)
+        again = rpc_rows(conn, 'claim_vote_tickets', p_limit=3, p_lease_seconds=30)
+        check('leased tickets are not claimed twice', [t['voter_id'] for t in again] == ['T3'], again)
+
+        statuses = rpc(conn, 'commit_votes', p_votes=[
+            {'voter_id': t['voter_id'], 'candidate_name': 'Carol', 'block_hash': uuid.uuid4().hex,
+             'previous_hash': uuid.uuid4().hex, 'timestamp': time.time()}
+            for t in claimed + [claimed[0]]])
+        check('commit_votes', statuses == ['ok', 'ok', 'ok', 'already_voted'], statuses)
+
+        rpc(conn, 'finish_vote_tickets', p_tickets=[
+            {'id': str(t['id']), 'status': 'committed', 'receipt': {'block_index': 1}, 'error': None}
+            for t in claimed])
+        rows = conn.execute("SELECT voter_id, status, receipt, claimed_until FROM vote_tickets "
+                            "WHERE status = 'committed' ORDER BY voter_id").fetchall()
+        check('finish_vote_tickets stores receipts',
+              [r['voter_id'] for r in rows] == ['T0', 'T1', 'T2']
+              and all(r['receipt'] == {'block_index': 1} and r['claimed_until'] is None for r in rows),
+              rows)
+
+        conn.execute("UPDATE vote_tickets SET claimed_until = NOW() - INTERVAL '1 second' "
+                     "WHERE voter_id = 'T3'")
+        expired = rpc_rows(conn, 'claim_vote_tickets', p_limit=3, p_lease_seconds=30)
+        check('an expired lease is claimed again',
+              [(t['voter_id'], t['attempts']) for t in expired] == [('T3', 2)], expired)
+
+
+CHECKS = [check_votes, check_tickets]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run supabase_setup.sql checks against a disposable Postgres.')
+    parser.add_argument('--dsn', help='server to create the throw-away database on (default: pgserver)')
+    args = parser.parse_args()
+
+    with PostgresHarness(args.dsn) as harness:
+        for run_check in CHECKS:
+            print(f'{run_check.__name__}:', file=sys.stderr)
+            run_check(harness)
+    print('All SQL checks passed', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Concurrent Vote Stress Test
+Usage:
+  python benchmarks/stress_votes.py [--votes N] [--threads N] [--difficulty N]
+  python benchmarks/stress_votes.py --url http://localhost:5000 --voter-ids V001 V002 ...
+Fires many concurrent votes, either straight at Blockchain.add_vote or
+at a running server's /api/vote, then asserts the chain is still a
+single valid line of blocks with every vote recorded exactly once.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blockchain import Blockchain
+
+
+def http_json(url, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else None
+    req = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(req, timeout=300) as resp:
+            return resp.status, json.load(resp)
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e)
+
+
+def stress_local(args):
+    chain = Blockchain(difficulty=args.difficulty, batch_size=args.batch_size)
+    voter_ids = [f'V{i:06d}' for i in range(args.votes)]
+
+    def vote(voter_id):
+        chain.add_vote(voter_id, 'Alice Johnson')
+        return 201
+
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        # Each voter twice: exactly one of the pair must be accepted
+        results = list(pool.map(lambda v: _attempt(vote, v), voter_ids + voter_ids))
+
+    assert results.count(201) == args.votes, results.count(201)
+    assert chain.is_chain_valid(full=True), 'chain forked or corrupted'
+    assert [b.index for b in chain.chain] == list(range(len(chain.chain)))
+    assert all(chain.find_vote(v) for v in voter_ids)
+    assert chain.get_stats()['total_votes'] == args.votes
+    return results
+
+
+def _attempt(vote, voter_id):
+    try:
+        return vote(voter_id)
+    except ValueError:
+        return 409
+
+
+def stress_http(args):
+    def vote(voter_id):
+        status, _ = http_json(f'{args.url}/api/vote', {
+            'voter_id': voter_id,
+            'candidate_name': args.candidate
+        })
+        return status
+
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        results = list(pool.map(vote, args.voter_ids))
+
+    status, report = http_json(f'{args.url}/api/blockchain/validate?full=1')
+    assert status == 200 and report['valid'], 'server chain failed validation'
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--votes', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=256)
+    parser.add_argument('--difficulty', type=int, default=2)
+    parser.add_argument('--batch-size', type=int, default=1)
+    parser.add_argument('--url', help='stress a running server instead of an in-process chain')
+    parser.add_argument('--voter-ids', nargs='*', default=[], help='registered voter IDs (with --url)')
+    parser.add_argument('--candidate', default='Alice Johnson')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = stress_http(args) if args.url else stress_local(args)
+    elapsed = time.perf_counter() - start
+
+    summary = {status: results.count(status) for status in sorted(set(results))}
+    print(f"  {len(results):,} vote attempts in {elapsed:.2f}s "
+          f"({len(results) / elapsed:,.0f}/sec) → {summary}")
+    print("  ✓ chain valid and linear")
+
+
+if __name__ == '__main__':
+    main()
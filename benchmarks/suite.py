@@ -0,0 +1,271 @@
+"""
+End-to-End Benchmark Suite
+Usage:
+  python benchmarks/suite.py [--quick] [--output results.json] [--compare baseline.json]
+Runs every scenario against in-process components and a local SQLite
+storage backend (no Supabase needed) and writes machine-readable JSON:
+
+  mining/difficulty=D          seconds per block at each difficulty
+  chain/size=N/<operation>     add_vote, find_vote and is_chain_valid
+                               (incremental and full) at each chain size
+  http/<endpoint>              concurrent load on /api/vote,
+                               /api/verify-vote and /api/admin/results
+
+Each entry reports count, p50/p95/p99/mean/max latency in ms and
+throughput per second. Progress goes to stderr. --compare prints the
+change against an earlier run so results can be tracked across commits.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from blockchain import Blockchain
+
+CANDIDATES = ['Alice Johnson', 'Bob Williams', 'Carol Martinez']
+
+
+def summarize(samples, elapsed=None):
+    """Latency percentiles (ms) and throughput for a list of durations in seconds."""
+    ordered = sorted(samples)
+
+    def pct(p):
+        return round(ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1000, 3)
+
+    elapsed = elapsed if elapsed is not None else sum(samples)
+    return {
+        'count': len(samples),
+        'p50_ms': pct(50),
+        'p95_ms': pct(95),
+        'p99_ms': pct(99),
+        'mean_ms': round(statistics.fmean(samples) * 1000, 3),
+        'max_ms': round(ordered[-1] * 1000, 3),
+        'throughput_per_sec': round(len(samples) / elapsed, 1) if elapsed > 0 else None
+    }
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+# ─── Chain scenarios ──────────────────────────────────────────────────
+
+def bench_mining(difficulties, blocks):
+    results = {}
+    for difficulty in difficulties:
+        chain = Blockchain(difficulty=difficulty)
+        samples = [timed(chain.add_vote, f'M{i:06d}', CANDIDATES[i % 3]) for i in range(blocks)]
+        assert chain.is_chain_valid(full=True)
+        results[f'mining/difficulty={difficulty}'] = summarize(samples)
+        report(f'mining/difficulty={difficulty}', results)
+    return results
+
+
+def bench_chain_scaling(sizes, samples):
+    results = {}
+    for size in sizes:
+        chain = Blockchain(difficulty=1)
+        for i in range(size - 1):
+            chain.add_vote(f'S{i:07d}', CANDIDATES[i % 3])
+        existing = [f'S{random.randrange(size - 1):07d}' for _ in range(samples)]
+        prefix = f'chain/size={size}'
+
+        found = [timed(chain.find_vote, v) for v in existing]
+        missing = [timed(chain.find_vote, f'X{i:07d}') for i in range(samples)]
+        added = [timed(chain.add_vote, f'N{i:07d}', CANDIDATES[0]) for i in range(samples)]
+        incremental = [timed(chain.is_chain_valid) for _ in range(samples)]
+        full = [timed(chain.is_chain_valid, True) for _ in range(max(3, samples // 50))]
+
+        results[f'{prefix}/find_vote'] = summarize(found)
+        results[f'{prefix}/find_vote_missing'] = summarize(missing)
+        results[f'{prefix}/add_vote'] = summarize(added)
+        results[f'{prefix}/is_chain_valid'] = summarize(incremental)
+        results[f'{prefix}/is_chain_valid_full'] = summarize(full)
+        for name in ('find_vote', 'add_vote', 'is_chain_valid', 'is_chain_valid_full'):
+            report(f'{prefix}/{name}', results)
+    return results
+
+
+# ─── HTTP scenarios ───────────────────────────────────────────────────
+
+def http_json(url, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else None
+    req = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(req, timeout=300) as resp:
+            resp.read()
+            return resp.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def load(concurrency, calls):
+    """Run (fn, args) calls concurrently; return latencies, statuses and wall time."""
+    def run(call):
+        start = time.perf_counter()
+        status = call[0](*call[1:])
+        return time.perf_counter() - start, status
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(run, calls))
+    elapsed = time.perf_counter() - start
+    statuses = {}
+    for _, status in outcomes:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    return [latency for latency, _ in outcomes], statuses, elapsed
+
+
+def bench_http(voters, concurrency, difficulty, batch_size):
+    """Serve the real app over HTTP against a throwaway SQLite database."""
+    workdir = tempfile.mkdtemp(prefix='blockvote-bench-')
+    os.environ.update({
+        'STORAGE_BACKEND': 'sqlite',
+        'SQLITE_PATH': os.path.join(workdir, 'bench.db'),
+        'MINING_DIFFICULTY': str(difficulty),
+        'VOTE_BATCH_SIZE': str(batch_size),
+        'VOTE_BATCH_INTERVAL': '0.05'
+    })
+    for key in ('CHAIN_DATA_DIR', 'CHAIN_SERVICE_SOCKET'):
+        os.environ.pop(key, None)
+
+    from werkzeug.serving import make_server
+    import app as voting_app
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    db = voting_app.db
+    db.bulk_add_candidates([{'name': n, 'party': 'Bench'} for n in CANDIDATES])
+    voter_ids = [f'H{i:06d}' for i in range(voters)]
+    db.bulk_add_voters([{'voter_id': v, 'name': v, 'email': f'{v}@bench.local'} for v in voter_ids])
+
+    server = make_server('127.0.0.1', 0, voting_app.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_port}'
+
+    results = {}
+    phases = [
+        ('http/vote', [(http_json, f'{url}/api/vote', {'voter_id': v, 'candidate_name': CANDIDATES[i % 3]})
+                       for i, v in enumerate(voter_ids)]),
+        ('http/verify_vote', [(http_json, f'{url}/api/verify-vote/{random.choice(voter_ids)}')
+                              for _ in range(voters)]),
+        ('http/results', [(http_json, f'{url}/api/admin/results') for _ in range(voters)])
+    ]
+    try:
+        for name, calls in phases:
+            latencies, statuses, elapsed = load(concurrency, calls)
+            results[name] = {**summarize(latencies, elapsed), 'status_codes': statuses}
+            report(name, results)
+    finally:
+        server.shutdown()
+    return results
+
+
+# ─── Reporting ────────────────────────────────────────────────────────
+
+def report(name, results):
+    r = results[name]
+    print(f"  {name:<42} p50 {r['p50_ms']:>9.3f}ms  p95 {r['p95_ms']:>9.3f}ms  "
+          f"p99 {r['p99_ms']:>9.3f}ms  {r['throughput_per_sec'] or 0:>10,.1f}/sec", file=sys.stderr)
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(baseline, results):
+    label = baseline['meta'].get('commit') or 'baseline'
+    print(f"\nChange vs {label} (p95 latency, throughput):", file=sys.stderr)
+    for name, current in results.items():
+        before = baseline['results'].get(name)
+        if not before:
+            continue
+        p95 = (current['p95_ms'] / before['p95_ms'] - 1) * 100 if before['p95_ms'] else 0
+        tput = ((current['throughput_per_sec'] or 0) / before['throughput_per_sec'] - 1) * 100 \
+            if before.get('throughput_per_sec') else 0
+        print(f"  {name:<42} p95 {p95:>+7.1f}%  throughput {tput:>+7.1f}%", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--quick', action='store_true', help='small sizes for a smoke run')
+    parser.add_argument('--only', nargs='*', choices=['mining', 'chain', 'http'],
+                        default=['mining', 'chain', 'http'])
+    parser.add_argument('--difficulties', type=int, nargs='*')
+    parser.add_argument('--mining-blocks', type=int)
+    parser.add_argument('--sizes', type=int, nargs='*', help='chain sizes for scaling runs')
+    parser.add_argument('--samples', type=int)
+    parser.add_argument('--http-voters', type=int)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--http-difficulty', type=int, default=2)
+    parser.add_argument('--batch-size', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='write JSON results to this file (default: stdout)')
+    parser.add_argument('--compare', help='earlier JSON results to compare against')
+    args = parser.parse_args()
+
+    defaults = {
+        'difficulties': [1, 2, 3] if args.quick else [1, 2, 3, 4, 5],
+        'mining_blocks': 10 if args.quick else 50,
+        'sizes': [100, 1000] if args.quick else [1000, 10000, 50000],
+        'samples': 50 if args.quick else 500,
+        'http_voters': 100 if args.quick else 1000
+    }
+    for key, value in defaults.items():
+        if getattr(args, key) is None:
+            setattr(args, key, value)
+    random.seed(args.seed)
+
+    results = {}
+    if 'mining' in args.only:
+        results.update(bench_mining(args.difficulties, args.mining_blocks))
+    if 'chain' in args.only:
+        results.update(bench_chain_scaling(args.sizes, args.samples))
+    if 'http' in args.only:
+        results.update(bench_http(args.http_voters, args.concurrency,
+                                  args.http_difficulty, args.batch_size))
+
+    output = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'args': vars(args)
+        },
+        'results': results
+    }
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(json.load(f), results)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(output, f, indent=2)
+        print(f"\nWrote {len(results)} results to {args.output}", file=sys.stderr)
+    else:
+        print(json.dumps(output, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,50 +1,467 @@
 """
 Blockchain Implementation for E-Voting System
 Uses SHA-256 hashing with Proof-of-Work consensus.
-Each block stores a single vote with cryptographic chaining.
+Each block stores a single vote with cryptographic chaining, or, in
+batching mode, many votes committed under a Merkle root.
 """
 
 import hashlib
 import json
+import math
+import multiprocessing
+import queue
+import sys
+import threading
 import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from metrics import Registry
+
+# Parallel mining state: one process pool per worker count, plus the
+# lowest winning nonce found so far, shared with every worker process.
+_NO_NONCE = 2 ** 63 - 1
+_pools = {}
+_pool_lock = threading.Lock()
+_best_nonce = None
+
+
+def _mining_bound(difficulty):
+    """
+    Return the exclusive upper bound on a raw 32-byte digest that
+    satisfies `difficulty` leading hex zeros, as big-endian bytes.
+    Comparing raw digests against this avoids a hexdigest per nonce.
+    """
+    return (16 ** (64 - difficulty)).to_bytes(32, 'big')
+
+
+def difficulty_target(difficulty):
+    """
+    Return the numeric hash target for a possibly fractional difficulty
+    as 64 hex chars: a digest must be below it. Integer difficulties give
+    the same bound as `difficulty` leading hex zeros; each +0.25 doubles
+    the expected work.
+    """
+    target = min(int(2 ** (256 - 4 * difficulty)), 2 ** 256 - 1)
+    return '%064x' % target
+
+
+def _target_bound(target):
+    """Raw 32-byte bound for a recorded target, or None if malformed."""
+    try:
+        bound = bytes.fromhex(target)
+    except (TypeError, ValueError):
+        return None
+    return bound if len(bound) == 32 else None
+
+
+class DifficultyController:
+    """
+    Picks the difficulty of each new block so mining takes about
+    `target_seconds`. The hash rate is estimated from the expected work
+    and measured time of the last `window` blocks; the difficulty moves
+    toward the level that rate would mine in `target_seconds`, by at
+    most `max_step` per block and within [min_difficulty, max_difficulty].
+    """
+
+    def __init__(self, target_seconds, difficulty=4.0, min_difficulty=1.0,
+                 max_difficulty=6.0, window=20, max_step=0.25):
+        self.target_seconds = target_seconds
+        self.min_difficulty = min_difficulty
+        self.max_difficulty = max_difficulty
+        self.max_step = max_step
+        self.difficulty = min(max(float(difficulty), min_difficulty), max_difficulty)
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds, difficulty):
+        """Feed back how long a block at `difficulty` took; returns the next difficulty."""
+        with self._lock:
+            self._samples.append((2 ** (4 * difficulty), max(seconds, 1e-6)))
+            work = sum(w for w, _ in self._samples)
+            elapsed = sum(t for _, t in self._samples)
+            ideal = math.log2(work / elapsed * self.target_seconds) / 4
+            step = min(max(ideal - self.difficulty, -self.max_step), self.max_step)
+            self.difficulty = min(max(self.difficulty + step, self.min_difficulty),
+                                  self.max_difficulty)
+            return self.difficulty
+
+
+def _init_mining_worker(best_nonce):
+    global _best_nonce
+    _best_nonce = best_nonce
+
+
+def _get_pool(workers):
+    """Return the shared process pool for `workers`, creating it once."""
+    global _best_nonce
+    if _best_nonce is None:
+        _best_nonce = multiprocessing.Value('q', _NO_NONCE)
+    pool = _pools.get(workers)
+    if pool is None:
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_mining_worker,
+            initargs=(_best_nonce,)
+        )
+        _pools[workers] = pool
+    return pool
+
+
+def _search_nonces(prefix, suffix, bound, start, step):
+    """
+    Worker loop for parallel mining: scan start, start+step, ...
+    and publish the first hit to the shared best nonce. Stops once its
+    position passes the best nonce any worker has found, so the lowest
+    valid nonce always wins and the other workers cancel themselves.
+    """
+    base = hashlib.sha256(prefix)
+    nonce = start
+    while nonce < _best_nonce.value:
+        for _ in range(1024):
+            h = base.copy()
+            h.update(str(nonce).encode())
+            h.update(suffix)
+            if h.digest() < bound:
+                with _best_nonce.get_lock():
+                    if nonce < _best_nonce.value:
+                        _best_nonce.value = nonce
+                return nonce
+            nonce += step
+    return None
+
+
+# ─── Merkle Trees ─────────────────────────────────────────────────────
+# Leaves and inner nodes are domain-separated (0x00 / 0x01 prefixes) so
+# an inner node can never be passed off as a vote leaf.
+
+def merkle_leaf(vote):
+    """Hash a vote record into a Merkle leaf (hex)."""
+    payload = json.dumps(vote, sort_keys=True).encode()
+    return hashlib.sha256(b'\x00' + payload).hexdigest()
+
+
+def _merkle_parent(left, right):
+    return hashlib.sha256(b'\x01' + bytes.fromhex(left) + bytes.fromhex(right)).hexdigest()
+
+
+def _merkle_levels(leaves):
+    """Build every tree level bottom-up; odd nodes are paired with themselves."""
+    levels = [list(leaves)]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        if len(level) % 2:
+            level = level + [level[-1]]
+        levels.append([_merkle_parent(level[i], level[i + 1])
+                       for i in range(0, len(level), 2)])
+    return levels
+
+
+def merkle_root(leaves):
+    """Return the Merkle root (hex) of a list of leaf hashes."""
+    if not leaves:
+        return hashlib.sha256(b'').hexdigest()
+    return _merkle_levels(leaves)[-1][0]
+
+
+def merkle_proof(leaves, position):
+    """
+    Return the inclusion proof for leaves[position] as a list of
+    {'hash', 'position'} steps, where position says which side the
+    sibling sits on.
+    """
+    proof = []
+    for level in _merkle_levels(leaves)[:-1]:
+        sibling = position ^ 1
+        if sibling >= len(level):
+            sibling = position
+        proof.append({
+            'hash': level[sibling],
+            'position': 'left' if sibling < position else 'right'
+        })
+        position //= 2
+    return proof
+
+
+def verify_merkle_proof(leaf, proof, root):
+    """Check that `leaf` is included under `root` using `proof`."""
+    node = leaf
+    for step in proof:
+        if step['position'] == 'left':
+            node = _merkle_parent(step['hash'], node)
+        else:
+            node = _merkle_parent(node, step['hash'])
+    return node == root
+
+
+# ─── Mutation Tracking ────────────────────────────────────────────────
+# Block contents are wrapped in dict/list subclasses that report writes
+# back to their block, so a chain can notice when an already-verified
+# block is modified in place and re-check it.
+
+_TRACKED_FIELDS = frozenset(('index', 'timestamp', 'data', 'previous_hash', 'nonce', 'votes',
+                             'hash', 'target'))
+
+# Values repeated across many blocks (record types, candidate names) are
+# interned so a million votes share one string object per candidate.
+_INTERNED_VALUES = frozenset(('type', 'candidate'))
+
+
+def _watch(value, owner):
+    if type(value) is dict or type(value) is _WatchedDict:
+        return _WatchedDict(value, owner)
+    if type(value) is list or type(value) is _WatchedList:
+        return _WatchedList(value, owner)
+    return value
+
+
+def _notifying(method):
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self._owner._touched()
+        return result
+    wrapper.__name__ = method.__name__
+    return wrapper
+
+
+class _WatchedDict(dict):
+    __slots__ = ('_owner',)
+
+    def __init__(self, data, owner):
+        super().__init__(
+            (sys.intern(k) if type(k) is str else k,
+             sys.intern(v) if k in _INTERNED_VALUES and type(v) is str else _watch(v, owner))
+            for k, v in data.items()
+        )
+        self._owner = owner
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, _watch(value, self._owner))
+        self._owner._touched()
+
+    __delitem__ = _notifying(dict.__delitem__)
+    pop = _notifying(dict.pop)
+    popitem = _notifying(dict.popitem)
+    clear = _notifying(dict.clear)
+    setdefault = _notifying(dict.setdefault)
+    update = _notifying(dict.update)
+    __ior__ = _notifying(dict.__ior__)
+
+
+class _WatchedList(list):
+    __slots__ = ('_owner',)
+
+    def __init__(self, data, owner):
+        super().__init__(_watch(v, owner) for v in data)
+        self._owner = owner
+
+    __setitem__ = _notifying(list.__setitem__)
+    __delitem__ = _notifying(list.__delitem__)
+    __iadd__ = _notifying(list.__iadd__)
+    __imul__ = _notifying(list.__imul__)
+    append = _notifying(list.append)
+    extend = _notifying(list.extend)
+    insert = _notifying(list.insert)
+    pop = _notifying(list.pop)
+    remove = _notifying(list.remove)
+    clear = _notifying(list.clear)
+    sort = _notifying(list.sort)
+    reverse = _notifying(list.reverse)
+
+
+def _pack_hash(value):
+    """Keep 64-char hex digests as raw 32-byte values; anything else as-is."""
+    if type(value) is str and len(value) == 64:
+        try:
+            return bytes.fromhex(value)
+        except ValueError:
+            pass
+    return value
+
+
+def _unpack_hash(value):
+    return value.hex() if type(value) is bytes else value
+
+
+def block_fault(current, previous):
+    """
+    Check one block (and its link to `previous`, if given). Returns None
+    if it is sound, otherwise the reason: hash_mismatch, broken_link,
+    target_not_met or merkle_mismatch.
+    """
+    # Recalculate and compare hash
+    if current._digest != current.calculate_digest():
+        return 'hash_mismatch'
+
+    # Verify chain linkage
+    if previous is not None and current._previous_digest != previous._digest:
+        return 'broken_link'
+
+    # Adaptive blocks must meet the target they recorded
+    if current.target is not None:
+        bound = _target_bound(current.target)
+        if bound is None or current._digest >= bound:
+            return 'target_not_met'
+
+    # Batch votes must match the committed Merkle root
+    if current.votes is not None and current.data.get('merkle_root') != \
+            merkle_root([merkle_leaf(v) for v in current.votes]):
+        return 'merkle_mismatch'
+    return None
 
 
 class Block:
-    """Represents a single block in the blockchain."""
+    """
+    Represents a single block in the blockchain.
+    Slotted, with hashes held as raw 32-byte digests; hex strings are
+    produced only when `hash` / `previous_hash` are read.
+    """
 
-    def __init__(self, index, timestamp, data, previous_hash, nonce=0):
+    __slots__ = ('_on_change', 'index', 'timestamp', 'data', '_previous_digest',
+                 'nonce', 'votes', 'target', '_digest')
+
+    def __init__(self, index, timestamp, data, previous_hash, nonce=0, votes=None, target=None):
+        # Called with the block whenever its contents change (set by the chain)
+        self._on_change = None
         self.index = index
         self.timestamp = timestamp
         self.data = data
         self.previous_hash = previous_hash
         self.nonce = nonce
+        # Batch blocks carry their votes outside the hashed header;
+        # data['merkle_root'] commits to them.
+        self.votes = votes
+        # Numeric PoW target (64 hex chars) for adaptively mined blocks;
+        # hashed with the header. None for fixed-difficulty blocks.
+        self.target = target
         self.hash = self.calculate_hash()
 
-    def calculate_hash(self):
-        """Generate SHA-256 hash of the block contents."""
-        block_string = json.dumps({
+    def __setattr__(self, name, value):
+        if name in ('data', 'votes'):
+            value = _watch(value, self)
+        object.__setattr__(self, name, value)
+        if name in _TRACKED_FIELDS:
+            self._touched()
+
+    def _touched(self):
+        if self._on_change is not None:
+            self._on_change(self)
+
+    @property
+    def hash(self):
+        return _unpack_hash(self._digest)
+
+    @hash.setter
+    def hash(self, value):
+        self._digest = _pack_hash(value)
+
+    @property
+    def previous_hash(self):
+        return _unpack_hash(self._previous_digest)
+
+    @previous_hash.setter
+    def previous_hash(self, value):
+        self._previous_digest = _pack_hash(value)
+
+    def calculate_digest(self):
+        """Raw 32-byte SHA-256 digest of the block contents."""
+        header = {
             'index': self.index,
             'timestamp': self.timestamp,
             'data': self.data,
             'previous_hash': self.previous_hash,
             'nonce': self.nonce
-        }, sort_keys=True)
-        return hashlib.sha256(block_string.encode()).hexdigest()
+        }
+        if self.target is not None:
+            header['target'] = self.target
+        block_string = json.dumps(header, sort_keys=True)
+        return hashlib.sha256(block_string.encode()).digest()
+
+    def calculate_hash(self):
+        """Generate SHA-256 hash of the block contents."""
+        return self.calculate_digest().hex()
+
+    def hash_parts(self):
+        """
+        Split the canonical JSON used by calculate_hash() around the nonce.
+        Keys are sorted, so the serialization is always
+        data, index, nonce, previous_hash, [target,] timestamp; everything except
+        the nonce digits is fixed for the whole mining run.
+        Returns (prefix, suffix) as bytes.
+        """
+        prefix = '{"data": %s, "index": %s, "nonce": ' % (
+            json.dumps(self.data, sort_keys=True),
+            json.dumps(self.index)
+        )
+        suffix = ', "previous_hash": %s, %s"timestamp": %s}' % (
+            json.dumps(self.previous_hash),
+            '' if self.target is None else '"target": %s, ' % json.dumps(self.target),
+            json.dumps(self.timestamp)
+        )
+        return prefix.encode(), suffix.encode()
 
-    def mine_block(self, difficulty):
+    def mine_block(self, difficulty, workers=1):
         """
         Proof-of-Work: find a nonce that produces a hash
-        starting with `difficulty` number of leading zeros.
+        starting with `difficulty` number of leading zeros, or below the
+        block's own numeric `target` when it has one.
+
+        The fixed prefix is fed to SHA-256 once and the partial state is
+        copied per nonce, so each attempt only hashes the nonce digits and
+        the short suffix. Hashes are identical to calculate_hash().
+
+        With workers > 1 the nonce space is interleaved across a process
+        pool. The lowest valid nonce is kept, so the result is the same
+        block the single-core search would produce.
         """
-        target = '0' * difficulty
-        while self.hash[:difficulty] != target:
-            self.nonce += 1
-            self.hash = self.calculate_hash()
+        if self.target is not None:
+            bound = _target_bound(self.target)
+        elif difficulty <= 0:
+            return self.hash
+        else:
+            bound = _mining_bound(difficulty)
+        if self._digest < bound:
+            return self.hash
+
+        prefix, suffix = self.hash_parts()
+
+        if workers > 1:
+            return self._mine_parallel(prefix, suffix, bound, workers)
+
+        base = hashlib.sha256(prefix)
+        nonce = self.nonce
+
+        while True:
+            nonce += 1
+            h = base.copy()
+            h.update(str(nonce).encode())
+            h.update(suffix)
+            if h.digest() < bound:
+                break
+
+        self.nonce = nonce
+        self.hash = h.hexdigest()
+        return self.hash
+
+    def _mine_parallel(self, prefix, suffix, bound, workers):
+        """Split the nonce search across `workers` processes."""
+        with _pool_lock:
+            pool = _get_pool(workers)
+            _best_nonce.value = _NO_NONCE
+            futures = [
+                pool.submit(_search_nonces, prefix, suffix, bound,
+                            self.nonce + 1 + i, workers)
+                for i in range(workers)
+            ]
+            found = [f.result() for f in futures]
+
+        self.nonce = min(n for n in found if n is not None)
+        self.hash = self.calculate_hash()
         return self.hash
 
-    def to_dict(self):
+    def to_dict(self, include_votes=True):
         """Serialize block to dictionary."""
-        return {
+        block = {
             'index': self.index,
             'timestamp': self.timestamp,
             'data': self.data,
@@ -52,86 +469,440 @@ class Block:
             'nonce': self.nonce,
             'hash': self.hash
         }
+        if self.target is not None:
+            block['target'] = self.target
+        if include_votes and self.votes is not None:
+            block['votes'] = self.votes
+        return block
+
+    @classmethod
+    def from_dict(cls, block):
+        """
+        Rebuild a block from to_dict() output without re-hashing it.
+        The stored hash is kept as-is so a tampered record still fails
+        validation.
+        """
+        restored = cls.__new__(cls)
+        object.__setattr__(restored, '_on_change', None)
+        restored.index = block['index']
+        restored.timestamp = block['timestamp']
+        restored.data = block['data']
+        restored.previous_hash = block['previous_hash']
+        restored.nonce = block['nonce']
+        restored.votes = block.get('votes')
+        restored.target = block.get('target')
+        restored.hash = block['hash']
+        return restored
+
+    def voter_ids(self):
+        """Return the voter IDs whose votes this block records."""
+        if self.votes is not None:
+            return [v.get('voter_id') for v in self.votes]
+        if self.data.get('type') == 'vote':
+            return [self.data.get('voter_id')]
+        return []
+
+    def inclusion_proof(self, voter_id):
+        """
+        Return the Merkle receipt for a voter's vote in this batch block,
+        or None if the block does not contain it.
+        """
+        if self.votes is None:
+            return None
+        for position, vote in enumerate(self.votes):
+            if vote.get('voter_id') == voter_id:
+                leaves = [merkle_leaf(v) for v in self.votes]
+                return {
+                    'vote': vote,
+                    'leaf': leaves[position],
+                    'proof': merkle_proof(leaves, position),
+                    'merkle_root': self.data['merkle_root']
+                }
+        return None
 
 
 class Blockchain:
     """Custom blockchain for recording votes with PoW consensus."""
 
-    def __init__(self, difficulty=4):
+    def __init__(self, difficulty=4, workers=1, batch_size=1, batch_interval=0.5, store=None,
+                 controller=None):
         self.chain = []
         self.difficulty = difficulty
-        self._create_genesis_block()
+        # Optional DifficultyController: new blocks then record a numeric
+        # target chosen per block instead of using `difficulty`.
+        self.controller = controller
+        self.workers = workers
+        # Batching mode (batch_size > 1): votes wait in the queue and are
+        # sealed together once batch_size is reached or the oldest
+        # pending vote has waited batch_interval seconds.
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        # Appends are serialized through one miner thread fed by a queue;
+        # _lock guards the chain, index and pending set against readers.
+        self._lock = threading.RLock()
+        self._queue = queue.Queue()
+        self._pending_voters = set()
+        self._miner = None
+        # voter_id -> index of the block holding their vote
+        self._vote_index = {}
+        # raw block digest -> index, for hash-based pagination cursors
+        self._hash_index = {}
+        self._vote_total = 0
+        # Blocks [0, _verified_upto) have passed validation and have not
+        # been modified since. Every block the chain holds reports changes
+        # through this one bound method rather than a closure of its own.
+        self._verified_upto = 0
+        self._on_block_change = self._block_changed
+        self._init_metrics()
+        # Optional durable ChainStore; every appended block is written to it.
+        self.store = None
+        if store is not None:
+            self._restore(store)
+        else:
+            self._create_genesis_block()
+
+    def _init_metrics(self):
+        """Mining and validation metrics, rendered by metrics_text()."""
+        self.metrics = Registry()
+        self._mining_seconds = self.metrics.histogram(
+            'blockvote_mining_seconds', 'Time to mine one block')
+        self._mining_nonces = self.metrics.histogram(
+            'blockvote_mining_nonces', 'Nonces tried per mined block',
+            buckets=(16, 256, 4096, 65536, 2 ** 20, 2 ** 24))
+        self._nonces_total = self.metrics.counter(
+            'blockvote_mining_nonces_total', 'Nonces tried across all mined blocks')
+        self._hash_rate = 0.0
+        self.metrics.gauge('blockvote_mining_hash_rate',
+                           'Hashes per second while mining the latest block',
+                           lambda: self._hash_rate)
+        self._validation_seconds = self.metrics.histogram(
+            'blockvote_validation_seconds', 'Chain validation duration', ('mode',))
+        self._blocks_validated = self.metrics.counter(
+            'blockvote_blocks_validated_total', 'Blocks re-hashed by validation')
+        self.metrics.gauge('blockvote_mining_difficulty', 'Difficulty of the next block',
+                           self.current_difficulty)
+        self.metrics.gauge('blockvote_chain_blocks', 'Blocks in the chain', lambda: len(self.chain))
+        self.metrics.gauge('blockvote_chain_votes', 'Votes recorded on the chain',
+                           lambda: self._vote_total)
+        self.metrics.gauge('blockvote_pending_votes', 'Votes queued for mining',
+                           lambda: self._queue.qsize())
+        self.metrics.gauge('blockvote_verified_blocks', 'Blocks below the validation watermark',
+                           lambda: self._verified_upto)
+
+    def current_difficulty(self):
+        """Difficulty the next block will be mined at."""
+        if self.controller:
+            return round(self.controller.difficulty, 2)
+        return self.difficulty
+
+    def metrics_text(self):
+        """Return chain metrics in Prometheus text format."""
+        return self.metrics.render()
+
+    def _restore(self, store):
+        """
+        Rebuild the chain from a ChainStore. Blocks covered by the store's
+        checkpoint are trusted; only the tail written after it is
+        re-hashed. An empty store gets a fresh genesis block.
+        """
+        blocks, trusted = store.load()
+        for block in blocks:
+            self._append_block(block)
+        self._verified_upto = trusted
+        if blocks and not self.is_chain_valid():
+            raise ValueError(f'Stored chain in {store.directory} failed validation')
+        self.store = store
+        if not blocks:
+            self._create_genesis_block()
 
     def _create_genesis_block(self):
         """Create the first block in the chain."""
         genesis = Block(0, time.time(), {'type': 'genesis', 'message': 'Genesis Block'}, '0')
-        genesis.mine_block(self.difficulty)
-        self.chain.append(genesis)
+        genesis.mine_block(self.difficulty, self.workers)
+        self._append_block(genesis)
 
     def get_latest_block(self):
         """Return the most recent block."""
         return self.chain[-1]
 
+    def load_chain(self, chain_data):
+        """
+        Replace the chain with serialized blocks and rebuild the voter
+        index. Loaded blocks are unverified until the next validation.
+        """
+        self.chain = []
+        self._vote_index = {}
+        self._hash_index = {}
+        self._vote_total = 0
+        self._verified_upto = 0
+        for block in chain_data:
+            self._append_block(Block.from_dict(block))
+
+    def _append_block(self, block):
+        """Persist a mined block, attach it to the chain and index its votes."""
+        if self.store is not None:
+            self.store.append(block)
+        block._on_change = self._on_block_change
+        self.chain.append(block)
+        self._index_block(block)
+
+    def _index_block(self, block):
+        self._hash_index[block._digest] = block.index
+        voter_ids = block.voter_ids()
+        for voter_id in voter_ids:
+            self._vote_index[voter_id] = block.index
+        self._vote_total += len(voter_ids)
+
+    def _block_changed(self, block):
+        """Move the verified watermark back to a block that was modified."""
+        position = block.index
+        # A rewritten index no longer locates the block: re-verify it all
+        if type(position) is not int or not 0 <= position < len(self.chain) \
+                or self.chain[position] is not block:
+            position = 0
+        if position < self._verified_upto:
+            self._verified_upto = position
+
+    def has_voted(self, voter_id):
+        """Return True if the voter already has a vote on the chain."""
+        return voter_id in self._vote_index
+
     def add_vote(self, voter_id, candidate):
         """
         Create a new block containing a vote,
         mine it, and append to the chain.
         Returns the mined block.
+
+        In batching mode the call returns once the batch block holding
+        the vote has been sealed.
+
+        Raises ValueError if the voter already has a vote on the chain.
+        """
+        return self.submit_vote(voter_id, candidate).result()
+
+    def add_votes(self, votes):
+        """
+        Queue (voter_id, candidate) pairs together and wait for all of
+        them, so in batching mode they can share blocks. Returns, per
+        vote, the Block holding it or the exception that refused it
+        (ValueError for a voter who already voted).
         """
-        vote_data = {
+        pending = []
+        for voter_id, candidate in votes:
+            try:
+                pending.append(self.submit_vote(voter_id, candidate))
+            except ValueError as e:
+                pending.append(e)
+        results = []
+        for future in pending:
+            if isinstance(future, Exception):
+                results.append(future)
+                continue
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def submit_vote(self, voter_id, candidate):
+        """
+        Queue a vote for the miner thread and return a Future that
+        resolves to the block holding it. Safe to call from any thread;
+        blocks are mined and appended strictly one after another.
+
+        Raises ValueError if the voter already has a vote on the chain
+        or queued for mining.
+        """
+        with self._lock:
+            if self.has_voted(voter_id) or voter_id in self._pending_voters:
+                raise ValueError('Voter has already voted')
+            self._pending_voters.add(voter_id)
+            if self._miner is None:
+                self._miner = threading.Thread(target=self._mine_loop, name='blockchain-miner', daemon=True)
+                self._miner.start()
+
+        future = Future()
+        self._queue.put(({
             'type': 'vote',
             'voter_id': voter_id,
             'candidate': candidate,
             'timestamp': time.time()
-        }
+        }, future, time.time()))
+        return future
+
+    def _mine_loop(self):
+        """Miner thread: take queued votes, mine them, append, resolve futures."""
+        while True:
+            entries = [self._queue.get()]
+            if self.batch_size > 1:
+                deadline = entries[0][2] + self.batch_interval
+                while len(entries) < self.batch_size:
+                    try:
+                        entries.append(self._queue.get(timeout=max(deadline - time.time(), 0)))
+                    except queue.Empty:
+                        break
+
+            votes = [vote for vote, _, _ in entries]
+            try:
+                block = self._seal(votes)
+            except Exception as e:
+                block, error = None, e
+            with self._lock:
+                self._pending_voters.difference_update(v['voter_id'] for v in votes)
+            for _, future, _ in entries:
+                if block is not None:
+                    future.set_result(block)
+                else:
+                    future.set_exception(error)
+
+    def _seal(self, votes):
+        """
+        Mine one block for the given votes and append it: a plain vote
+        block in single-vote mode, otherwise a Merkle batch block.
+        """
+        if self.batch_size > 1:
+            data = {
+                'type': 'batch',
+                'merkle_root': merkle_root([merkle_leaf(v) for v in votes]),
+                'vote_count': len(votes)
+            }
+            block_votes = votes
+        else:
+            data, block_votes = votes[0], None
+
+        difficulty = self.controller.difficulty if self.controller else self.difficulty
         new_block = Block(
             index=len(self.chain),
             timestamp=time.time(),
-            data=vote_data,
-            previous_hash=self.get_latest_block().hash
+            data=data,
+            previous_hash=self.get_latest_block().hash,
+            votes=block_votes,
+            target=difficulty_target(difficulty) if self.controller else None
         )
-        new_block.mine_block(self.difficulty)
-        self.chain.append(new_block)
+        start = time.perf_counter()
+        new_block.mine_block(self.difficulty, self.workers)
+        elapsed = time.perf_counter() - start
+        self._mining_seconds.observe(elapsed)
+        self._mining_nonces.observe(new_block.nonce)
+        self._nonces_total.inc(new_block.nonce)
+        if elapsed > 0:
+            self._hash_rate = new_block.nonce / elapsed
+        if self.controller:
+            self.controller.record(elapsed, difficulty)
+        with self._lock:
+            self._append_block(new_block)
         return new_block
 
-    def is_chain_valid(self):
+    def is_chain_valid(self, full=False):
         """
-        Validate the entire blockchain:
+        Validate the blockchain:
         - Each block's stored hash matches its recalculated hash
         - Each block's previous_hash matches the prior block's hash
+
+        Only blocks past the verified watermark are checked, so repeated
+        calls cost O(new blocks). Modifying a verified block moves the
+        watermark back to it. Pass full=True to re-check every block.
         """
-        for i in range(1, len(self.chain)):
-            current = self.chain[i]
-            previous = self.chain[i - 1]
+        with self._lock:
+            return self._validate(full)
 
-            # Recalculate and compare hash
-            if current.hash != current.calculate_hash():
-                return False
+    def _validate(self, full):
+        start = time.perf_counter()
+        valid = self._check_blocks(1 if full else max(1, self._verified_upto))
+        self._validation_seconds.observe(time.perf_counter() - start,
+                                         'full' if full else 'incremental')
+        return valid
 
-            # Verify chain linkage
-            if current.previous_hash != previous.hash:
+    def _check_blocks(self, start):
+        self._blocks_validated.inc(max(0, len(self.chain) - start))
+        for i in range(start, len(self.chain)):
+            if block_fault(self.chain[i], self.chain[i - 1]) is not None:
                 return False
 
+        self._verified_upto = len(self.chain)
         return True
 
+    def audit(self, workers=None, segment_size=None):
+        """
+        Full audit across a process pool; returns a report with the first
+        bad block and throughput instead of a bare boolean (see audit.py).
+        """
+        from audit import audit_blocks
+        with self._lock:
+            blocks = self.chain[:]
+        return audit_blocks(blocks, workers, segment_size)
+
     def find_vote(self, voter_id):
-        """Search the chain for a vote cast by the given voter."""
-        for block in self.chain:
-            if block.data.get('type') == 'vote' and block.data.get('voter_id') == voter_id:
-                return block.to_dict()
-        return None
+        """
+        Look up the vote cast by the given voter via the voter index.
+        Votes in batch blocks come back as the block header plus the
+        vote and its Merkle inclusion proof.
+        """
+        index = self._vote_index.get(voter_id)
+        if index is None:
+            return None
+        block = self.chain[index]
+        if block.votes is not None:
+            return {**block.to_dict(include_votes=False), **block.inclusion_proof(voter_id)}
+        return block.to_dict()
+
+    def vote_records(self, voter_ids):
+        """
+        Bulk lookup for reconciliation: map each of `voter_ids` that has
+        a vote on the chain to its candidate, block hash and block index.
+        """
+        records = {}
+        for voter_id in voter_ids:
+            index = self._vote_index.get(voter_id)
+            if index is None:
+                continue
+            block = self.chain[index]
+            if block.votes is None:
+                candidate = block.data.get('candidate')
+            else:
+                candidate = next(v['candidate'] for v in block.votes if v.get('voter_id') == voter_id)
+            records[voter_id] = {'candidate': candidate, 'block_hash': block.hash, 'block_index': index}
+        return records
 
-    def get_chain(self):
-        """Return the full chain as a list of dicts."""
-        return [block.to_dict() for block in self.chain]
+    def __len__(self):
+        return len(self.chain)
+
+    def get_chain(self, start=0, limit=None):
+        """
+        Return the chain as a list of dicts: the whole chain by default,
+        or `limit` blocks from index `start`.
+        """
+        end = len(self.chain) if limit is None else start + limit
+        return [block.to_dict() for block in self.chain[start:end]]
+
+    def iter_blocks(self, start=0):
+        """Yield block dicts one at a time from index `start` onwards."""
+        for i in range(start, len(self.chain)):
+            yield self.chain[i].to_dict()
+
+    def block_position(self, cursor):
+        """
+        Resolve a pagination cursor (a block index, as int or digit
+        string, or a block hash) to a block index.
+        Raises ValueError if no such block exists.
+        """
+        if isinstance(cursor, int) or str(cursor).isdigit():
+            position = int(cursor)
+            if position < len(self.chain):
+                return position
+        elif _pack_hash(cursor) in self._hash_index:
+            return self._hash_index[_pack_hash(cursor)]
+        raise ValueError(f'Unknown block cursor: {cursor}')
 
     def get_stats(self):
-        """Return chain statistics."""
-        vote_blocks = [b for b in self.chain if b.data.get('type') == 'vote']
+        """
+        Return chain statistics. Counts are maintained on append and
+        validation is incremental, so this is cheap to call repeatedly.
+        """
         return {
             'total_blocks': len(self.chain),
-            'total_votes': len(vote_blocks),
-            'difficulty': self.difficulty,
+            'total_votes': self._vote_total,
+            'difficulty': self.current_difficulty(),
             'latest_hash': self.get_latest_block().hash,
             'is_valid': self.is_chain_valid()
         }
@@ -0,0 +1,185 @@
+"""
+Caches
+SnapshotCache holds one precomputed value (e.g. the results dashboard
+payload) that readers get in O(1). The value is rebuilt by a loader when
+it is older than `max_age` seconds or has been invalidated, and writers
+can patch it in place of a reload when they know exactly what changed.
+
+LRUCache is a bounded per-key cache (e.g. voter records) with the same
+expiry and patching model.
+
+Both count writes (update/invalidate) in a generation number. A load
+that overlapped a write is returned but not cached, since it may or may
+not include that write and the patch was applied to nothing (or would
+be applied twice).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class SnapshotCache:
+    """Single-value cache with a staleness bound and hit/miss counters."""
+
+    def __init__(self, loader, max_age=2.0):
+        self.loader = loader
+        self.max_age = max_age
+        self._value = None
+        self._loaded_at = 0.0
+        self._valid = False
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.updates = 0
+
+    def _fresh(self):
+        return self._valid and time.monotonic() - self._loaded_at < self.max_age
+
+    def get(self):
+        """Return the cached snapshot, reloading it if stale."""
+        if self._fresh():
+            self.hits += 1
+            return self._value
+        with self._load_lock:
+            # Another thread may have reloaded while we waited
+            if self._fresh():
+                self.hits += 1
+                return self._value
+            self.misses += 1
+            generation = self._generation
+            value = self.loader()
+            with self._lock:
+                if self._generation == generation:
+                    self._value, self._loaded_at, self._valid = value, time.monotonic(), True
+            return value
+
+    def invalidate(self):
+        """Force the next get() to reload, including one already running."""
+        with self._lock:
+            self._generation += 1
+            self._valid = False
+            self.invalidations += 1
+
+    def update(self, apply):
+        """
+        Replace a fresh snapshot with apply(snapshot) without reloading.
+        `apply` must return a new object; readers holding the old one
+        keep a consistent view. A stale or empty cache is left for the
+        next get() to reload.
+        """
+        with self._lock:
+            self._generation += 1
+            if self._fresh():
+                self._value = apply(self._value)
+                self.updates += 1
+
+    def metrics(self):
+        """Return hit/miss counters and the current snapshot age."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+            'invalidations': self.invalidations,
+            'updates': self.updates,
+            'age_seconds': round(time.monotonic() - self._loaded_at, 3) if self._valid else None,
+            'max_age_seconds': self.max_age
+        }
+
+
+class LRUCache:
+    """
+    Key-value cache holding at most `maxsize` entries, each fresh for
+    `ttl` seconds. The least recently used entry is evicted first.
+    """
+
+    def __init__(self, maxsize=10000, ttl=60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.updates = 0
+
+    def get(self, key):
+        """Return the cached value, or None if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[1] >= self.ttl:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value):
+        with self._lock:
+            self._store(key, value)
+
+    def _store(self, key, value):
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def load(self, key, loader):
+        """
+        Return the cached value, or loader(key) on a miss. A non-None
+        loaded value is cached unless an update() or invalidate() ran
+        while it was loading.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        generation = self._generation
+        value = loader(key)
+        if value is not None:
+            with self._lock:
+                if self._generation == generation:
+                    self._store(key, value)
+        return value
+
+    def update(self, key, apply):
+        """
+        Replace a cached value with apply(value), keeping its age.
+        Keys that are not cached are left alone.
+        """
+        with self._lock:
+            self._generation += 1
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = (apply(entry[0]), entry[1])
+                self.updates += 1
+
+    def invalidate(self, key=None):
+        """Drop one key, or everything when no key is given."""
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def metrics(self):
+        """Return hit/miss counters and the current size."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+            'evictions': self.evictions,
+            'updates': self.updates,
+            'size': len(self._entries),
+            'max_size': self.maxsize,
+            'ttl_seconds': self.ttl
+        }
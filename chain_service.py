@@ -0,0 +1,255 @@
+"""
+Chain Service
+Single-writer process that owns the voting Blockchain and serves it to
+web workers over a local Unix socket, so every gunicorn worker sees the
+same ledger instead of building its own.
+
+Usage:
+  python chain_service.py              # serve on $CHAIN_SERVICE_SOCKET
+  CHAIN_SERVICE_SOCKET=/tmp/blockvote-chain.sock gunicorn app:app -w 4
+
+gunicorn.conf.py starts this process automatically when
+CHAIN_SERVICE_SOCKET is set. Requests and responses are single JSON
+lines: {"method": ..., "params": {...}} -> {"result": ...} or
+{"error": ..., "type": ...}.
+"""
+
+import atexit
+import json
+import os
+import queue
+import signal
+import socket
+import socketserver
+import sys
+import threading
+from contextlib import contextmanager
+
+from dotenv import load_dotenv
+from blockchain import Block, Blockchain, DifficultyController
+from chain_store import ChainStore
+
+DEFAULT_SOCKET = '/tmp/blockvote-chain.sock'
+
+
+def build_chain():
+    """Build the Blockchain described by the environment."""
+    store = None
+    if os.getenv('CHAIN_DATA_DIR'):
+        store = ChainStore(
+            os.getenv('CHAIN_DATA_DIR'),
+            fsync=os.getenv('CHAIN_FSYNC', 'always'),
+            checkpoint_every=int(os.getenv('CHAIN_CHECKPOINT_EVERY', '1000'))
+        )
+        atexit.register(store.close)
+
+    # MINING_TARGET_SECONDS turns on adaptive difficulty: each block's
+    # target is tuned to hold mining time near it, starting from
+    # MINING_DIFFICULTY and kept within the MIN/MAX bounds.
+    controller = None
+    if os.getenv('MINING_TARGET_SECONDS'):
+        controller = DifficultyController(
+            target_seconds=float(os.getenv('MINING_TARGET_SECONDS')),
+            difficulty=float(os.getenv('MINING_DIFFICULTY', '4')),
+            min_difficulty=float(os.getenv('MINING_MIN_DIFFICULTY', '2')),
+            max_difficulty=float(os.getenv('MINING_MAX_DIFFICULTY', '6'))
+        )
+
+    return Blockchain(
+        difficulty=int(float(os.getenv('MINING_DIFFICULTY', '4'))),
+        workers=int(os.getenv('MINING_WORKERS', '1')),
+        batch_size=int(os.getenv('VOTE_BATCH_SIZE', '1')),
+        batch_interval=float(os.getenv('VOTE_BATCH_INTERVAL', '0.5')),
+        store=store,
+        controller=controller
+    )
+
+
+# ─── Server ───────────────────────────────────────────────────────────
+
+class _ChainRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                result = self.server.dispatch(request['method'], request.get('params', {}))
+                response = {'result': result}
+            except Exception as e:
+                response = {'error': str(e), 'type': type(e).__name__}
+            self.wfile.write(json.dumps(response).encode() + b'\n')
+            self.wfile.flush()
+
+
+class ChainServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serves one Blockchain to many clients; one thread per connection."""
+
+    daemon_threads = True
+
+    def __init__(self, chain, socket_path):
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        super().__init__(socket_path, _ChainRequestHandler)
+        self.chain = chain
+
+    def dispatch(self, method, params):
+        chain = self.chain
+        if method == 'add_vote':
+            return chain.add_vote(params['voter_id'], params['candidate']).to_dict()
+        if method == 'add_votes':
+            # Each block is sent once, however many of the votes it holds
+            blocks = {}
+            results = []
+            for outcome in chain.add_votes([(v['voter_id'], v['candidate']) for v in params['votes']]):
+                if isinstance(outcome, Exception):
+                    results.append({'error': str(outcome), 'type': type(outcome).__name__})
+                else:
+                    blocks.setdefault(outcome.hash, outcome.to_dict())
+                    results.append({'block': outcome.hash})
+            return {'blocks': blocks, 'results': results}
+        if method == 'find_vote':
+            return chain.find_vote(params['voter_id'])
+        if method == 'has_voted':
+            return chain.has_voted(params['voter_id'])
+        if method == 'is_chain_valid':
+            return chain.is_chain_valid(full=params.get('full', False))
+        if method == 'get_stats':
+            return chain.get_stats()
+        if method == 'get_chain':
+            return chain.get_chain(params.get('start', 0), params.get('limit'))
+        if method == 'length':
+            return len(chain)
+        if method == 'block_position':
+            return chain.block_position(params['cursor'])
+        if method == 'metrics_text':
+            return chain.metrics_text()
+        if method == 'vote_records':
+            return chain.vote_records(params['voter_ids'])
+        if method == 'audit':
+            return chain.audit(params.get('workers'), params.get('segment_size'))
+        raise ValueError(f'Unknown method: {method}')
+
+
+# ─── Client ───────────────────────────────────────────────────────────
+
+class RemoteBlockchain:
+    """
+    Drop-in stand-in for Blockchain that forwards calls to a ChainServer.
+    Calls check a connection out of a pool of at most `pool_size`, so
+    request threads and gevent greenlets alike reuse a few connections
+    instead of opening one each.
+    """
+
+    def __init__(self, socket_path, pool_size=16):
+        self.socket_path = socket_path
+        # Idle connections, most recently returned first
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(pool_size)
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(self.socket_path)
+        return sock, sock.makefile('rb')
+
+    @contextmanager
+    def _connection(self):
+        """Check a connection out for one call; waits while all are in use."""
+        with self._slots:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+            try:
+                yield conn
+            except BaseException:
+                # Interrupted mid-call: the reply may still be in flight
+                conn[1].close()
+                conn[0].close()
+                raise
+            self._idle.put(conn)
+
+    def _call(self, method, **params):
+        payload = json.dumps({'method': method, 'params': params}).encode() + b'\n'
+        with self._connection() as (sock, reader):
+            sock.sendall(payload)
+            line = reader.readline()
+            if not line:
+                raise ConnectionError('Chain service closed the connection')
+        response = json.loads(line)
+        if 'error' in response:
+            if response['type'] == 'ValueError':
+                raise ValueError(response['error'])
+            raise RuntimeError(f"Chain service error: {response['error']}")
+        return response['result']
+
+    def add_vote(self, voter_id, candidate):
+        return Block.from_dict(self._call('add_vote', voter_id=voter_id, candidate=candidate))
+
+    def add_votes(self, votes):
+        response = self._call('add_votes', votes=[{'voter_id': v, 'candidate': c} for v, c in votes])
+        blocks = {h: Block.from_dict(b) for h, b in response['blocks'].items()}
+        results = []
+        for outcome in response['results']:
+            if 'block' in outcome:
+                results.append(blocks[outcome['block']])
+            elif outcome['type'] == 'ValueError':
+                results.append(ValueError(outcome['error']))
+            else:
+                results.append(RuntimeError(f"Chain service error: {outcome['error']}"))
+        return results
+
+    def find_vote(self, voter_id):
+        return self._call('find_vote', voter_id=voter_id)
+
+    def has_voted(self, voter_id):
+        return self._call('has_voted', voter_id=voter_id)
+
+    def is_chain_valid(self, full=False):
+        return self._call('is_chain_valid', full=full)
+
+    def get_stats(self):
+        return self._call('get_stats')
+
+    def __len__(self):
+        return self._call('length')
+
+    def get_chain(self, start=0, limit=None):
+        return self._call('get_chain', start=start, limit=limit)
+
+    def iter_blocks(self, start=0, page_size=500):
+        """Stream blocks page by page so memory stays bounded."""
+        while True:
+            page = self.get_chain(start, page_size)
+            yield from page
+            if len(page) < page_size:
+                return
+            start += page_size
+
+    def block_position(self, cursor):
+        return self._call('block_position', cursor=cursor)
+
+    def metrics_text(self):
+        return self._call('metrics_text')
+
+    def vote_records(self, voter_ids):
+        return self._call('vote_records', voter_ids=voter_ids)
+
+    def audit(self, workers=None, segment_size=None):
+        return self._call('audit', workers=workers, segment_size=segment_size)
+
+
+def main():
+    load_dotenv()
+    socket_path = os.getenv('CHAIN_SERVICE_SOCKET', DEFAULT_SOCKET)
+    server = ChainServer(build_chain(), socket_path)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"Chain service listening on {socket_path}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+if __name__ == '__main__':
+    main()
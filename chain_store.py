@@ -0,0 +1,202 @@
+"""
+Durable Chain Store
+Append-only on-disk log for the voting blockchain.
+
+Blocks are written as one JSON line each to numbered segment files
+(segment-000000.log, ...). A checkpoint file records how many blocks
+have been durably written and verified, so a restart only re-hashes the
+blocks appended after the last checkpoint.
+
+fsync policies:
+  always    fsync after every block (default, no acknowledged vote is lost)
+  interval  fsync at most every `fsync_interval` seconds
+  never     leave flushing to the OS
+
+Only one process may write a store. Loading for writing (or the first
+append) takes an exclusive flock on store.lock in the directory; a
+second writer fails instead of interleaving records and forking the
+chain. Read-only loads (repair=False) take no lock.
+"""
+
+import fcntl
+import json
+import mmap
+import os
+import time
+
+from blockchain import Block
+
+CHECKPOINT_FILE = 'checkpoint.json'
+LOCK_FILE = 'store.lock'
+FSYNC_POLICIES = ('always', 'interval', 'never')
+
+
+class ChainStore:
+    """Segmented append-only block log with periodic checkpoints."""
+
+    def __init__(self, directory, fsync='always', fsync_interval=1.0,
+                 checkpoint_every=1000, segment_bytes=64 * 1024 * 1024):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f'fsync must be one of {", ".join(FSYNC_POLICIES)}')
+        self.directory = directory
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.checkpoint_every = checkpoint_every
+        self.segment_bytes = segment_bytes
+
+        self._file = None
+        self._lock_file = None
+        self._segment = 0
+        self._block_count = 0
+        self._last_hash = None
+        self._checkpointed = 0
+        self._last_sync = time.monotonic()
+        os.makedirs(directory, exist_ok=True)
+
+    # ─── Paths ────────────────────────────────────────────────────────
+
+    def _segment_path(self, number):
+        return os.path.join(self.directory, f'segment-{number:06d}.log')
+
+    def _segments(self):
+        return sorted(
+            int(name[8:14]) for name in os.listdir(self.directory)
+            if name.startswith('segment-') and name.endswith('.log')
+        )
+
+    # ─── Writer lock ──────────────────────────────────────────────────
+
+    def _lock(self):
+        """Take the directory's exclusive writer lock, once per store."""
+        if self._lock_file is not None:
+            return
+        lock_file = open(os.path.join(self.directory, LOCK_FILE), 'a')
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            raise RuntimeError(
+                f'Chain store {self.directory} is already open for writing by another process. '
+                'Run several workers through the chain service (set CHAIN_SERVICE_SOCKET) '
+                'so that a single process owns the store.') from None
+        self._lock_file = lock_file
+
+    # ─── Loading ──────────────────────────────────────────────────────
+
+    def _read_checkpoint(self):
+        path = os.path.join(self.directory, CHECKPOINT_FILE)
+        if not os.path.exists(path):
+            return {'blocks': 0, 'last_hash': None}
+        with open(path) as f:
+            return json.load(f)
+
+    def load(self, repair=True):
+        """
+        Read every block from the log via mmap.
+        Returns (blocks, trusted) where blocks [0, trusted) are covered
+        by the checkpoint and need no re-hashing. A torn final record
+        from a crash mid-write is truncated away, unless repair=False
+        (read-only use alongside a live writer, e.g. audit.py).
+        Loading with repair takes the writer lock.
+        """
+        if repair:
+            self._lock()
+        checkpoint = self._read_checkpoint()
+        blocks = []
+        segments = self._segments()
+
+        for number in segments:
+            path = self._segment_path(number)
+            size = os.path.getsize(path)
+            if size == 0:
+                continue
+            good = 0
+            with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                while good < size:
+                    end = mm.find(b'\n', good)
+                    if end == -1:
+                        break
+                    try:
+                        record = json.loads(mm[good:end])
+                    except ValueError:
+                        break
+                    blocks.append(Block.from_dict(record))
+                    good = end + 1
+            if good < size:
+                if number != segments[-1]:
+                    raise ValueError(f'Corrupt record in {path} at byte {good}')
+                if not repair:
+                    break
+                with open(path, 'r+b') as f:
+                    f.truncate(good)
+
+        trusted = checkpoint['blocks']
+        if trusted > len(blocks) or (trusted and blocks[trusted - 1].hash != checkpoint['last_hash']):
+            # Checkpoint does not match the log; trust nothing.
+            trusted = 0
+
+        self._segment = segments[-1] if segments else 0
+        self._block_count = len(blocks)
+        self._last_hash = blocks[-1].hash if blocks else None
+        self._checkpointed = trusted
+        return blocks, trusted
+
+    # ─── Writing ──────────────────────────────────────────────────────
+
+    def append(self, block):
+        """Durably append one block according to the fsync policy."""
+        self._lock()
+        if self._file is None:
+            self._file = open(self._segment_path(self._segment), 'ab')
+        elif self._file.tell() >= self.segment_bytes:
+            self._sync()
+            self._file.close()
+            self._segment += 1
+            self._file = open(self._segment_path(self._segment), 'ab')
+
+        record = json.dumps(block.to_dict(), separators=(',', ':'))
+        self._file.write(record.encode() + b'\n')
+        self._file.flush()
+
+        if self.fsync == 'always' or (
+                self.fsync == 'interval' and
+                time.monotonic() - self._last_sync >= self.fsync_interval):
+            self._sync()
+
+        self._block_count += 1
+        self._last_hash = block.hash
+        if self._block_count - self._checkpointed >= self.checkpoint_every:
+            self.checkpoint()
+
+    def _sync(self):
+        if self._file is not None and self.fsync != 'never':
+            os.fsync(self._file.fileno())
+        self._last_sync = time.monotonic()
+
+    def checkpoint(self):
+        """Record that every block written so far is durable and verified."""
+        self._sync()
+        path = os.path.join(self.directory, CHECKPOINT_FILE)
+        tmp = path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({
+                'blocks': self._block_count,
+                'last_hash': self._last_hash,
+                'segment': self._segment,
+                'created_at': time.time()
+            }, f)
+            f.flush()
+            if self.fsync != 'never':
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+        self._checkpointed = self._block_count
+
+    def close(self):
+        """Flush, checkpoint and close the current segment, then release the lock."""
+        if self._file is not None:
+            self.checkpoint()
+            self._file.close()
+            self._file = None
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
@@ -1,47 +1,24 @@
 """
 Admin Creation Script
 Usage: python create_admin.py <email> <password>
-Creates a Supabase Auth user and inserts a matching row into the admins table.
+Creates an admin account in the configured storage backend (a Supabase
+Auth user plus admins row, or a local SQLite admin).
 """
 
 import sys
-import os
 from dotenv import load_dotenv
-from supabase import create_client
+from storage import create_storage
 
 load_dotenv()
 
-SUPABASE_URL = os.getenv('SUPABASE_URL')
-SUPABASE_KEY = os.getenv('SUPABASE_ANON_KEY')
-
 
 def create_admin(email: str, password: str):
-    supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+    db = create_storage()
 
     print(f"Creating admin user: {email}")
 
     try:
-        # Create auth user (with auto-confirm to skip email verification)
-        auth_response = supabase.auth.sign_up({
-            'email': email,
-            'password': password,
-            'options': {
-                'data': {
-                    'role': 'admin'
-                }
-            }
-        })
-
-        user_id = auth_response.user.id
-        print(f"Auth user created: {user_id}")
-
-        # Insert into admins table
-        supabase.table('admins').insert({
-            'user_id': user_id,
-            'email': email,
-            'role': 'super_admin'
-        }).execute()
-
+        db.create_admin(email, password)
         print(f"Admin record created for {email}")
         print("Login at http://localhost:5000/admin")
 
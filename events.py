@@ -0,0 +1,89 @@
+"""
+Event Broadcaster
+In-process fan-out for live dashboard updates (Server-Sent Events).
+
+Published events go into one shared ring buffer; every subscriber reads
+from that buffer by sequence number, so publishing costs the same for
+one dashboard or hundreds. Subscribers block on a Condition, which under
+gunicorn's gevent worker is a cooperative wait rather than an OS thread
+per connection.
+
+Each broadcaster is local to one process and only sees the votes that
+process published. Event IDs carry a per-broadcaster stream ID, so a
+client that reconnects to another worker (or to a restarted one), or
+that fell further behind than the buffer reaches, is sent a `reset`
+event telling it to reload the full results instead of resuming.
+"""
+
+import itertools
+import json
+import threading
+import uuid
+from collections import deque
+
+
+class EventBroadcaster:
+    """Ring buffer of recent events with blocking, resumable subscriptions."""
+
+    def __init__(self, history=1000, heartbeat=15.0):
+        self.heartbeat = heartbeat
+        self._events = deque(maxlen=history)
+        self._seq = itertools.count(1)
+        self._last_seq = 0
+        self._cond = threading.Condition()
+        self.stream_id = uuid.uuid4().hex[:12]
+        self.subscribers = 0
+
+    def publish(self, event_type, data):
+        """Append an event and wake every subscriber."""
+        with self._cond:
+            self._last_seq = next(self._seq)
+            self._events.append((self._last_seq, event_type, data))
+            self._cond.notify_all()
+
+    def _since(self, seq):
+        if seq >= self._last_seq:
+            return []
+        return [e for e in self._events if e[0] > seq]
+
+    def _can_resume(self, stream_id, seq):
+        """Whether every event after `seq` of `stream_id` is still buffered here."""
+        if stream_id != self.stream_id or not 0 <= seq <= self._last_seq:
+            return False
+        return not self._events or seq >= self._events[0][0] - 1
+
+    def _message(self, seq, event_type, data):
+        return f'id: {self.stream_id}-{seq}\nevent: {event_type}\ndata: {json.dumps(data)}\n\n'
+
+    def subscribe(self, resume=None):
+        """
+        Yield SSE-formatted messages forever, starting after `resume`
+        (a (stream_id, seq) pair parsed from Last-Event-ID) or from now.
+        A resume point this broadcaster cannot replay from yields a
+        `reset` event first. Emits a comment line every `heartbeat`
+        seconds so proxies keep the connection open.
+        """
+        with self._cond:
+            seq = self._last_seq
+            reset = resume is not None and not self._can_resume(*resume)
+            if resume is not None and not reset:
+                seq = resume[1]
+        self.subscribers += 1
+        try:
+            yield 'retry: 3000\n\n'
+            if reset:
+                yield self._message(seq, 'reset', {})
+            while True:
+                with self._cond:
+                    pending = self._since(seq)
+                    if not pending:
+                        self._cond.wait(self.heartbeat)
+                        pending = self._since(seq)
+                if not pending:
+                    yield ': keep-alive\n\n'
+                    continue
+                for event_seq, event_type, data in pending:
+                    seq = event_seq
+                    yield self._message(event_seq, event_type, data)
+        finally:
+            self.subscribers -= 1
@@ -0,0 +1,38 @@
+"""
+Gunicorn Configuration
+When CHAIN_SERVICE_SOCKET is set, the master starts chain_service.py
+before forking workers so every worker shares one ledger.
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+_chain_service = None
+
+
+def on_starting(server):
+    global _chain_service
+    socket_path = os.getenv('CHAIN_SERVICE_SOCKET')
+    if not socket_path:
+        return
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    _chain_service = subprocess.Popen(
+        [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'chain_service.py')]
+    )
+    # Genesis mining happens before the socket is bound
+    deadline = time.time() + 60
+    while not os.path.exists(socket_path):
+        if _chain_service.poll() is not None or time.time() > deadline:
+            raise RuntimeError('Chain service failed to start')
+        time.sleep(0.05)
+    server.log.info(f"Chain service running on {socket_path} (pid {_chain_service.pid})")
+
+
+def on_exit(server):
+    if _chain_service is not None and _chain_service.poll() is None:
+        _chain_service.terminate()
+        _chain_service.wait(timeout=10)
@@ -0,0 +1,148 @@
+"""
+Bulk Voter Import
+Usage: python import_voters.py <file.csv|file.ndjson> [--chunk-size N]
+Streams an electoral roll (CSV with voter_id,name,email columns, or one
+JSON object per line), validates each row in memory and registers voters
+with chunked multi-row inserts through the storage backend (see
+storage.py). Voter IDs that already exist are skipped by the database,
+so no pre-check query is needed.
+Also used by the /api/admin/import-voters endpoint.
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+
+from dotenv import load_dotenv
+
+from storage import create_storage
+
+CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+
+def iter_rows(stream, fmt):
+    """Yield (line_number, row_dict) pairs from a text stream."""
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == 'ndjson':
+        for line_number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield line_number, row if isinstance(row, dict) else None
+    else:
+        raise ValueError(f'Unsupported format: {fmt} (use csv or ndjson)')
+
+
+def detect_format(filename, content_type=''):
+    """Pick csv or ndjson from a file name or MIME type."""
+    name = (filename or '').lower()
+    if name.endswith(('.ndjson', '.jsonl')) or 'ndjson' in content_type:
+        return 'ndjson'
+    return 'csv'
+
+
+def validate_row(row):
+    """Return (voter, None) for a valid row or (None, error message)."""
+    if row is None:
+        return None, 'Malformed record'
+    voter_id = str(row.get('voter_id') or '').strip()
+    name = str(row.get('name') or '').strip()
+    email = str(row.get('email') or '').strip()
+
+    if not all([voter_id, name, email]):
+        return None, 'voter_id, name, and email are required'
+    if '@' not in email:
+        return None, 'Invalid email address'
+    return {'voter_id': voter_id, 'name': name, 'email': email, 'has_voted': False}, None
+
+
+def import_voters(db, rows, chunk_size=CHUNK_SIZE):
+    """
+    Validate and insert (line_number, row) pairs in chunks.
+    Returns a report with counts, per-row errors and throughput.
+    """
+    report = {
+        'processed': 0,
+        'inserted': 0,
+        'skipped_existing': 0,
+        'error_count': 0,
+        'errors': []
+    }
+    seen = set()
+    chunk = []
+    start = time.perf_counter()
+
+    def error(line_number, voter_id, message):
+        report['error_count'] += 1
+        if len(report['errors']) < MAX_REPORTED_ERRORS:
+            report['errors'].append({'line': line_number, 'voter_id': voter_id, 'error': message})
+
+    def flush():
+        try:
+            inserted = db.bulk_add_voters(chunk)
+        except Exception as e:
+            for voter in chunk:
+                error(None, voter['voter_id'], f'Insert failed: {e}')
+            return
+        report['inserted'] += inserted
+        report['skipped_existing'] += len(chunk) - inserted
+
+    for line_number, row in rows:
+        report['processed'] += 1
+        voter, message = validate_row(row)
+        if message:
+            error(line_number, (row or {}).get('voter_id'), message)
+            continue
+        if voter['voter_id'] in seen:
+            error(line_number, voter['voter_id'], 'Duplicate voter_id in file')
+            continue
+        seen.add(voter['voter_id'])
+        chunk.append(voter)
+        if len(chunk) >= chunk_size:
+            flush()
+            chunk = []
+    if chunk:
+        flush()
+
+    elapsed = time.perf_counter() - start
+    report['seconds'] = round(elapsed, 3)
+    report['rows_per_sec'] = round(report['processed'] / elapsed, 1) if elapsed > 0 else None
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk-register voters from CSV or NDJSON.')
+    parser.add_argument('file')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--format', choices=['csv', 'ndjson'], help='default: from the file extension')
+    args = parser.parse_args()
+
+    load_dotenv()
+    db = create_storage()
+
+    fmt = args.format or detect_format(args.file)
+    with open(args.file, newline='', encoding='utf-8') as f:
+        report = import_voters(db, iter_rows(f, fmt), args.chunk_size)
+
+    print(f"Processed {report['processed']:,} rows in {report['seconds']}s "
+          f"({report['rows_per_sec']:,} rows/sec)")
+    print(f"  ✓ {report['inserted']:,} inserted")
+    print(f"  • {report['skipped_existing']:,} already registered")
+    print(f"  ✗ {report['error_count']:,} errors")
+    for e in report['errors'][:20]:
+        print(f"    line {e['line']}: {e['voter_id']}: {e['error']}")
+    if report['error_count']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
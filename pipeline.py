@@ -0,0 +1,188 @@
+"""
+Vote Commit Pipeline
+Background half of accept-then-commit voting. /api/vote validates a
+vote, stores it durably as a ticket (vote_tickets, see storage.py) and
+answers 202 straight away; this pipeline then works through the pending
+tickets in batches:
+
+  1. claim    up to `batch_size` pending tickets under a lease, so several
+              workers can run pipelines without taking the same ticket
+  2. mine     submit the whole batch to the chain at once (with
+              VOTE_BATCH_SIZE > 1 the votes share Merkle batch blocks)
+  3. commit   record the mined votes with one commit_votes call
+  4. finish   store each ticket's block receipt, or why it was refused
+
+A ticket whose worker dies mid-batch is picked up again once its lease
+runs out. A vote that reached the chain or the votes table before the
+crash is recognised on the retry and completes with its original
+block, so a ticket never produces two votes.
+"""
+
+import threading
+import time
+from datetime import datetime
+
+from blockchain import Block
+
+# Refusals are final; anything else (chain or database errors) leaves the
+# ticket pending for another attempt once its lease runs out, since an
+# accepted vote must eventually be committed.
+REFUSALS = ('already_voted', 'voter_not_found', 'candidate_not_found')
+
+
+def vote_receipt(block, voter_id, candidate):
+    """The receipt returned to a voter for a vote mined into `block`."""
+    receipt = {
+        'voter_id': voter_id,
+        'candidate': candidate,
+        'block_hash': block.hash,
+        'block_index': block.index,
+        'timestamp': block.timestamp
+    }
+    inclusion = block.inclusion_proof(voter_id)
+    if inclusion:
+        receipt['merkle'] = inclusion
+    return receipt
+
+
+class CommitPipeline:
+    """Claims pending vote tickets, mines and commits them in batches."""
+
+    def __init__(self, chain, db, registry, batch_size=100, interval=0.2, lease=30.0,
+                 on_commit=None):
+        self.chain = chain
+        self.db = db
+        self.batch_size = batch_size
+        self.interval = interval
+        self.lease = lease
+        # Called as on_commit(voter_id, candidate, block) for each vote
+        # this pipeline committed, after its ticket is finished.
+        self.on_commit = on_commit
+        self._wake = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self.last_error = None
+
+        self._tickets = registry.counter(
+            'blockvote_vote_tickets_total', 'Vote tickets finished by the commit pipeline',
+            ('outcome',))
+        self._stage_seconds = registry.histogram(
+            'blockvote_pipeline_stage_seconds', 'Time per commit pipeline batch stage', ('stage',))
+        self._ticket_seconds = registry.histogram(
+            'blockvote_ticket_commit_seconds', 'Time from vote acceptance to commit')
+        self._batch_errors = registry.counter(
+            'blockvote_pipeline_errors_total', 'Commit pipeline batches that raised')
+
+    def start(self):
+        """Start the background thread; later calls only wake it."""
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='vote-commit-pipeline',
+                                                    daemon=True)
+                    self._thread.start()
+        self._wake.set()
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def _run(self):
+        while True:
+            self._wake.clear()
+            try:
+                processed = self.run_once()
+            except Exception as e:
+                self._batch_errors.inc()
+                self.last_error = str(e)
+                processed = 0
+            # A full batch means more may be waiting; otherwise idle until
+            # woken by a new ticket or the next poll.
+            if processed < self.batch_size:
+                self._wake.wait(self.interval)
+
+    # ─── One batch ────────────────────────────────────────────────────
+
+    def run_once(self):
+        """Process one batch of pending tickets; returns how many were claimed."""
+        with self._stage_seconds.time('claim'):
+            tickets = self.db.claim_tickets(self.batch_size, self.lease)
+        if not tickets:
+            return 0
+
+        finished = []
+        with self._stage_seconds.time('mining'):
+            mined = self._mine(tickets, finished)
+
+        with self._stage_seconds.time('commit'):
+            committed = self._commit(mined, finished)
+
+        with self._stage_seconds.time('finish'):
+            self.db.finish_tickets(finished)
+
+        now = time.time()
+        for ticket, block in committed:
+            self._ticket_seconds.observe(now - datetime.fromisoformat(ticket['created_at']).timestamp())
+            if self.on_commit:
+                self.on_commit(ticket['voter_id'], ticket['candidate_name'], block)
+        return len(tickets)
+
+    def _mine(self, tickets, finished):
+        """Put the batch on the chain; returns (ticket, block) pairs."""
+        if not tickets:
+            return []
+        outcomes = self.chain.add_votes([(t['voter_id'], t['candidate_name']) for t in tickets])
+        mined = []
+        for ticket, outcome in zip(tickets, outcomes):
+            if isinstance(outcome, ValueError):
+                # Already on the chain: ours from an interrupted attempt,
+                # or a different vote by the same voter
+                outcome = self._recover(ticket)
+                if outcome is None:
+                    finished.append(self._finish(ticket, 'rejected', error='already_voted'))
+                    continue
+            elif isinstance(outcome, Exception):
+                self.last_error = str(outcome)
+                continue
+            mined.append((ticket, outcome))
+        return mined
+
+    def _recover(self, ticket):
+        """Return the chain block holding this ticket's vote, if the chain has it."""
+        record = self.chain.vote_records([ticket['voter_id']]).get(ticket['voter_id'])
+        if record is None or record['candidate'] != ticket['candidate_name']:
+            return None
+        return Block.from_dict(self.chain.get_chain(record['block_index'], 1)[0])
+
+    def _commit(self, mined, finished):
+        """Record mined votes in the database; returns the newly committed pairs."""
+        if not mined:
+            return []
+        statuses = self.db.commit_votes([{
+            'voter_id': ticket['voter_id'],
+            'candidate_name': ticket['candidate_name'],
+            'block_hash': block.hash,
+            'previous_hash': block.previous_hash,
+            'timestamp': block.timestamp
+        } for ticket, block in mined])
+
+        # 'already_voted' with our block hash in the votes table means an
+        # earlier attempt committed it before it could finish the ticket
+        repeats = [t['voter_id'] for (t, _), status in zip(mined, statuses) if status == 'already_voted']
+        stored = {r['voter_id']: r['block_hash'] for r in self.db.get_votes(repeats)} if repeats else {}
+
+        committed = []
+        for (ticket, block), status in zip(mined, statuses):
+            receipt = vote_receipt(block, ticket['voter_id'], ticket['candidate_name'])
+            if status == 'ok':
+                committed.append((ticket, block))
+                finished.append(self._finish(ticket, 'committed', receipt=receipt))
+            elif status == 'already_voted' and stored.get(ticket['voter_id']) == block.hash:
+                finished.append(self._finish(ticket, 'committed', receipt=receipt))
+            elif status in REFUSALS:
+                finished.append(self._finish(ticket, 'rejected', error=status))
+        return committed
+
+    def _finish(self, ticket, status, receipt=None, error=None):
+        self._tickets.inc(1, error or status)
+        return {'id': ticket['id'], 'status': status, 'receipt': receipt, 'error': error}
@@ -0,0 +1,97 @@
+"""
+Sampling Profiler
+Low-overhead statistical profiler that can be switched on and off at
+runtime (see /api/admin/profiler). While running, a background OS
+thread snapshots every thread's Python stack each `interval` seconds
+and counts identical stacks; the report lists the hottest stacks in
+collapsed "file:function;file:function" form, ready for flame graphs.
+
+Nothing is sampled while stopped. Under gevent the sampler runs on a
+real OS thread so it keeps ticking while greenlets are busy.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+
+def _start_os_thread(target):
+    """Start `target` on a real OS thread, even when gevent has patched threading."""
+    try:
+        from gevent import monkey
+        if monkey.is_module_patched('threading'):
+            monkey.get_original('_thread', 'start_new_thread')(target, ())
+            return
+    except ImportError:
+        pass
+    threading.Thread(target=target, name='sampling-profiler', daemon=True).start()
+
+
+def _collapse(frame, max_depth):
+    parts = []
+    while frame is not None and len(parts) < max_depth:
+        code = frame.f_code
+        parts.append(f'{os.path.basename(code.co_filename)}:{code.co_name}')
+        frame = frame.f_back
+    return ';'.join(reversed(parts))
+
+
+class SamplingProfiler:
+    """Counts sampled stacks between start() and stop()."""
+
+    def __init__(self, interval=0.01, max_depth=40):
+        self.interval = interval
+        self.max_depth = max_depth
+        self._stacks = Counter()
+        self._samples = 0
+        self._running = False
+        self._started_at = None
+        self._stopped_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self):
+        return self._running
+
+    def start(self, interval=None):
+        """Clear previous samples and begin sampling. No-op if already running."""
+        with self._lock:
+            if self._running:
+                return
+            if interval:
+                self.interval = interval
+            self._stacks = Counter()
+            self._samples = 0
+            self._running = True
+            self._started_at, self._stopped_at = time.time(), None
+        _start_os_thread(self._run)
+
+    def stop(self):
+        """Stop sampling; collected samples stay available to report()."""
+        with self._lock:
+            if self._running:
+                self._running = False
+                self._stopped_at = time.time()
+
+    def _run(self):
+        me = threading.get_ident()
+        while self._running:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != me:
+                    self._stacks[_collapse(frame, self.max_depth)] += 1
+            self._samples += 1
+            time.sleep(self.interval)
+
+    def report(self, top=50):
+        """Return sampling status and the `top` most frequent stacks."""
+        end = self._stopped_at or time.time()
+        stacks = self._stacks.most_common(top)
+        return {
+            'running': self._running,
+            'interval': self.interval,
+            'duration_seconds': round(end - self._started_at, 3) if self._started_at else 0,
+            'samples': self._samples,
+            'stacks': [{'stack': stack, 'count': count} for stack, count in stacks]
+        }
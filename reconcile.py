@@ -0,0 +1,263 @@
+"""
+Tally Reconciliation
+Usage:
+  python reconcile.py [--full] [--state FILE] [--data-dir DIR | --socket PATH]
+Checks that the vote chain, the votes table and the candidates.vote_count
+counters agree:
+
+  1. One streaming pass over the chain, a page of blocks at a time,
+     counting votes per candidate and looking up each page's voters in
+     the votes table with one bulk query.
+  2. A keyset-paged pass over the votes table, looking up each page's
+     voters on the chain in one bulk call.
+  3. A comparison of chain tallies, votes-table tallies and counters.
+
+Reported issues: missing_db_vote (on the chain, not in the votes table),
+mismatched_voter (different candidate or block), missing_block (in the
+votes table, not on the chain) and drifted_counter.
+
+Memory is bounded by the page sizes and the number of open issues. The
+state (last reconciled block index, running chain tallies and open
+issues) is kept between runs, so a re-run only scans blocks and votes
+added since, plus re-checks earlier issues. Also served by
+/api/admin/reconcile.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+BLOCK_PAGE_SIZE = 1000
+VOTE_PAGE_SIZE = 1000
+MAX_OPEN_ISSUES = 10000
+# Votes committed while a run is in progress can carry a created_at
+# slightly before its start; the next run re-scans this window.
+VOTES_OVERLAP_SECONDS = 300
+
+
+def _block_votes(block):
+    """Yield (voter_id, candidate, block_hash, block_index) for each vote in a block dict."""
+    if 'votes' in block:
+        for vote in block['votes']:
+            yield vote['voter_id'], vote['candidate'], block['hash'], block['index']
+    elif block['data'].get('type') == 'vote':
+        data = block['data']
+        yield data['voter_id'], data['candidate'], block['hash'], block['index']
+
+
+def _empty_state():
+    return {
+        'reconciled_upto': 0,
+        'chain_tallies': {},
+        'votes_since': None,
+        'open_issues': []
+    }
+
+
+class Reconciler:
+    """Incremental chain-vs-database tally reconciliation."""
+
+    def __init__(self, chain, db, state_path=None, block_page=BLOCK_PAGE_SIZE,
+                 vote_page=VOTE_PAGE_SIZE):
+        self.chain = chain
+        self.db = db
+        self.state_path = state_path
+        self.block_page = block_page
+        self.vote_page = vote_page
+        self._lock = threading.Lock()
+        self.state = self._load_state()
+
+    def _load_state(self):
+        if self.state_path and os.path.exists(self.state_path):
+            with open(self.state_path, encoding='utf-8') as f:
+                return json.load(f)
+        return _empty_state()
+
+    def _save_state(self):
+        if not self.state_path:
+            return
+        tmp = self.state_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f)
+        os.replace(tmp, self.state_path)
+
+    # ─── Checks ───────────────────────────────────────────────────────
+
+    def _check_chain_votes(self, votes, issues):
+        """Compare (voter_id, candidate, block_hash, index) chain votes with the votes table."""
+        rows = {r['voter_id']: r for r in self.db.get_votes([v[0] for v in votes])}
+        for voter_id, candidate, block_hash, index in votes:
+            row = rows.get(voter_id)
+            if row is None:
+                issues[('missing_db_vote', voter_id)] = {
+                    'type': 'missing_db_vote', 'voter_id': voter_id, 'candidate': candidate,
+                    'block_hash': block_hash, 'block_index': index
+                }
+            else:
+                self._compare(row, {'candidate': candidate, 'block_hash': block_hash,
+                                    'block_index': index}, issues)
+
+    def _check_db_votes(self, rows, issues):
+        """Compare vote rows with the chain: absent voters are missing blocks."""
+        records = self.chain.vote_records([r['voter_id'] for r in rows])
+        for row in rows:
+            record = records.get(row['voter_id'])
+            if record is None:
+                issues[('missing_block', row['voter_id'])] = {
+                    'type': 'missing_block',
+                    'voter_id': row['voter_id'],
+                    'db_candidate': row['candidate_name'],
+                    'db_block_hash': row['block_hash']
+                }
+            else:
+                self._compare(row, record, issues)
+
+    @staticmethod
+    def _compare(row, record, issues):
+        if row['candidate_name'] != record['candidate'] or row['block_hash'] != record['block_hash']:
+            issues[('mismatched_voter', row['voter_id'])] = {
+                'type': 'mismatched_voter',
+                'voter_id': row['voter_id'],
+                **record,
+                'db_candidate': row['candidate_name'],
+                'db_block_hash': row['block_hash']
+            }
+
+    def _recheck(self, open_issues, issues):
+        """Re-evaluate issues from earlier runs; resolved ones are dropped."""
+        chain_side = [i for i in open_issues if 'candidate' in i]
+        for start in range(0, len(chain_side), self.vote_page):
+            page = chain_side[start:start + self.vote_page]
+            self._check_chain_votes(
+                [(i['voter_id'], i['candidate'], i['block_hash'], i['block_index']) for i in page],
+                issues)
+        db_side = [i for i in open_issues if 'candidate' not in i]
+        for start in range(0, len(db_side), self.vote_page):
+            page = db_side[start:start + self.vote_page]
+            self._check_db_votes(
+                [{'voter_id': i['voter_id'], 'candidate_name': i['db_candidate'],
+                  'block_hash': i['db_block_hash']} for i in page],
+                issues)
+
+    # ─── Run ──────────────────────────────────────────────────────────
+
+    def run(self, full=False):
+        """
+        Reconcile blocks and vote rows added since the last run (or
+        everything with full=True) and return the report.
+        """
+        with self._lock:
+            started = time.perf_counter()
+            started_at = datetime.now(timezone.utc)
+            state = _empty_state() if full else self.state
+            issues = {}
+
+            # 0. Issues still open from earlier runs
+            self._recheck(state['open_issues'], issues)
+
+            # 1. Chain pass: stream new blocks page by page. Counter.update
+            #    counts a page's candidates in one C-level call.
+            tallies = Counter(state['chain_tallies'])
+            position = state['reconciled_upto']
+            end = len(self.chain)
+            blocks_scanned = chain_votes = 0
+            while position < end:
+                blocks = self.chain.get_chain(position, min(self.block_page, end - position))
+                if not blocks:
+                    break
+                votes = [v for block in blocks for v in _block_votes(block)]
+                tallies.update(candidate for _, candidate, _, _ in votes)
+                if votes:
+                    self._check_chain_votes(votes, issues)
+                position += len(blocks)
+                blocks_scanned += len(blocks)
+                chain_votes += len(votes)
+
+            # 2. Votes-table pass: rows created since the last run
+            db_votes = 0
+            for rows in self.db.iter_votes(state['votes_since'], self.vote_page):
+                self._check_db_votes(rows, issues)
+                db_votes += len(rows)
+
+            # 3. Counters: chain vs votes table vs candidates.vote_count
+            table_tallies = self.db.vote_tallies()
+            counters = {c['name']: c['vote_count'] for c in self.db.candidate_results()}
+            report_counters = []
+            drifted = []
+            for name in sorted(set(tallies) | set(table_tallies) | set(counters)):
+                entry = {
+                    'candidate': name,
+                    'chain': tallies.get(name, 0),
+                    'votes_table': table_tallies.get(name, 0),
+                    'counter': counters.get(name, 0)
+                }
+                entry['ok'] = entry['chain'] == entry['votes_table'] == entry['counter']
+                report_counters.append(entry)
+                if not entry['ok']:
+                    drifted.append({'type': 'drifted_counter', **entry})
+
+            open_issues = list(issues.values())
+            self.state = {
+                'reconciled_upto': position,
+                'chain_tallies': dict(tallies),
+                'votes_since': (started_at - timedelta(seconds=VOTES_OVERLAP_SECONDS)).isoformat(),
+                'open_issues': open_issues[:MAX_OPEN_ISSUES]
+            }
+            self._save_state()
+
+            all_issues = open_issues + drifted
+            return {
+                'consistent': not all_issues,
+                'full': full,
+                'reconciled_from': state['reconciled_upto'],
+                'reconciled_upto': position,
+                'blocks_scanned': blocks_scanned,
+                'chain_votes_scanned': chain_votes,
+                'db_votes_scanned': db_votes,
+                'chain_total_votes': sum(tallies.values()),
+                'counters': report_counters,
+                'issue_counts': dict(Counter(i['type'] for i in all_issues)),
+                'issues': all_issues[:1000],
+                'issues_truncated': len(open_issues) > MAX_OPEN_ISSUES,
+                'seconds': round(time.perf_counter() - started, 3)
+            }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Reconcile chain tallies with the database.')
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--data-dir', default=os.getenv('CHAIN_DATA_DIR', 'chain_data'),
+                        help='ChainStore directory (default: $CHAIN_DATA_DIR or chain_data)')
+    source.add_argument('--socket', help='read the chain from a running chain service')
+    parser.add_argument('--state', default='reconcile_state.json',
+                        help='where to keep progress between runs')
+    parser.add_argument('--full', action='store_true', help='ignore saved progress and rescan everything')
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    from storage import create_storage
+    load_dotenv()
+
+    if args.socket:
+        from chain_service import RemoteBlockchain
+        chain = RemoteBlockchain(args.socket)
+    else:
+        from blockchain import Blockchain
+        from chain_store import ChainStore
+        blocks, _ = ChainStore(args.data_dir, fsync='never').load(repair=False)
+        chain = Blockchain(difficulty=0)
+        chain.load_chain(b.to_dict() for b in blocks)
+
+    report = Reconciler(chain, create_storage(), args.state).run(full=args.full)
+    print(json.dumps(report, indent=2))
+    if not report['consistent']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
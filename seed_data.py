@@ -3,18 +3,15 @@ Seed Data Script
 Populates the database with sample candidates and voters for testing.
 """
 
-import os
 from dotenv import load_dotenv
-from supabase import create_client
+from import_voters import import_voters
+from storage import create_storage
 
 load_dotenv()
 
-SUPABASE_URL = os.getenv('SUPABASE_URL')
-SUPABASE_KEY = os.getenv('SUPABASE_ANON_KEY')
-
 
 def seed_data():
-    supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+    db = create_storage()
 
     # ── Candidates ────────────────────────────────────────────────
     candidates = [
@@ -51,12 +48,12 @@ def seed_data():
     ]
 
     print("Seeding candidates...")
-    for c in candidates:
-        try:
-            supabase.table('candidates').insert(c).execute()
+    try:
+        db.bulk_add_candidates(candidates)
+        for c in candidates:
             print(f"  ✓ {c['name']} ({c['party']})")
-        except Exception as e:
-            print(f"  ✗ {c['name']}: {e}")
+    except Exception as e:
+        print(f"  ✗ candidates: {e}")
 
     # ── Voters ────────────────────────────────────────────────────
     voters = [
@@ -73,12 +70,10 @@ def seed_data():
     ]
 
     print("\nSeeding voters...")
-    for v in voters:
-        try:
-            supabase.table('voters').insert(v).execute()
-            print(f"  ✓ {v['voter_id']} - {v['name']}")
-        except Exception as e:
-            print(f"  ✗ {v['voter_id']}: {e}")
+    report = import_voters(db, enumerate(voters, 1))
+    print(f"  ✓ {report['inserted']} inserted, {report['skipped_existing']} already registered")
+    for e in report['errors']:
+        print(f"  ✗ {e['voter_id']}: {e['error']}")
 
     print("\nSeed data complete!")
     print("Test voter IDs: V001 through V010")
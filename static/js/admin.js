@@ -6,6 +6,14 @@
 
 const API = '';
 let adminToken = null;
+let nextBlockCursor = null;
+let latestResults = null;
+let resultsStream = null;
+let resultsResync = null;
+
+// Each server worker streams only the votes it handled, so live deltas
+// are topped up with a full results reload at this interval.
+const RESULTS_RESYNC_MS = 30000;
 
 // ─── Helpers ────────────────────────────────────────────────────────
 
@@ -53,6 +61,7 @@ document.getElementById('admin-login-form').addEventListener('submit', async (e)
         document.getElementById('dashboard-screen').style.display = 'grid';
 
         loadOverview();
+        startLiveUpdates();
     } catch (err) {
         showAlert('login-alert', err.message);
     } finally {
@@ -90,6 +99,7 @@ document.querySelectorAll('.sidebar-nav a[data-section]').forEach(link => {
 document.getElementById('logout-btn').addEventListener('click', (e) => {
     e.preventDefault();
     adminToken = null;
+    stopLiveUpdates();
     document.getElementById('dashboard-screen').style.display = 'none';
     document.getElementById('login-screen').style.display = 'block';
     document.getElementById('admin-email').value = '';
@@ -98,48 +108,54 @@ document.getElementById('logout-btn').addEventListener('click', (e) => {
 
 // ─── Overview ───────────────────────────────────────────────────────
 
+function resultCardsHtml(results, emptyMessage) {
+    if (results.length === 0) {
+        return `
+            <div class="glass-card text-center text-muted" style="padding:48px; grid-column:1/-1;">
+                <i data-lucide="inbox" style="width:32px;height:32px;margin-bottom:12px;opacity:0.4;"></i>
+                <p>${emptyMessage}</p>
+            </div>`;
+    }
+    return results.map(r => `
+        <div class="glass-card result-card">
+            <div class="r-header">
+                <div class="r-avatar">${r.name.charAt(0)}</div>
+                <div>
+                    <div class="r-name">${r.name}</div>
+                    <div class="r-party">${r.party}</div>
+                </div>
+            </div>
+            <div class="vote-bar">
+                <div class="vote-bar-fill" style="width:${r.percentage}%"></div>
+            </div>
+            <div class="r-stats">
+                <span class="count">${r.vote_count} votes</span>
+                <span>${r.percentage}%</span>
+            </div>
+        </div>
+    `).join('');
+}
+
+function renderOverviewResults(resultsData) {
+    const stats = resultsData.stats;
+    document.getElementById('stat-voters').textContent = stats.total_voters;
+    document.getElementById('stat-voted').textContent = stats.voted;
+    document.getElementById('stat-turnout').textContent = stats.turnout + '%';
+    document.getElementById('overview-results').innerHTML =
+        resultCardsHtml(resultsData.results, 'No results yet. Waiting for votes…');
+    lucide.createIcons();
+}
+
 async function loadOverview() {
     try {
-        const [resultsData, candidatesData, votersData] = await Promise.all([
+        const [resultsData, candidatesData] = await Promise.all([
             apiRequest('/api/admin/results'),
-            apiRequest('/api/admin/candidates'),
-            apiRequest('/api/admin/voters')
+            apiRequest('/api/admin/candidates')
         ]);
 
-        const stats = resultsData.stats;
+        latestResults = resultsData;
         document.getElementById('stat-candidates').textContent = candidatesData.candidates.length;
-        document.getElementById('stat-voters').textContent = stats.total_voters;
-        document.getElementById('stat-voted').textContent = stats.voted;
-        document.getElementById('stat-turnout').textContent = stats.turnout + '%';
-
-        const container = document.getElementById('overview-results');
-        if (resultsData.results.length === 0) {
-            container.innerHTML = `
-                <div class="glass-card text-center text-muted" style="padding:48px; grid-column:1/-1;">
-                    <i data-lucide="inbox" style="width:32px;height:32px;margin-bottom:12px;opacity:0.4;"></i>
-                    <p>No results yet. Waiting for votes…</p>
-                </div>`;
-        } else {
-            container.innerHTML = resultsData.results.map(r => `
-                <div class="glass-card result-card">
-                    <div class="r-header">
-                        <div class="r-avatar">${r.name.charAt(0)}</div>
-                        <div>
-                            <div class="r-name">${r.name}</div>
-                            <div class="r-party">${r.party}</div>
-                        </div>
-                    </div>
-                    <div class="vote-bar">
-                        <div class="vote-bar-fill" style="width:${r.percentage}%"></div>
-                    </div>
-                    <div class="r-stats">
-                        <span class="count">${r.vote_count} votes</span>
-                        <span>${r.percentage}%</span>
-                    </div>
-                </div>
-            `).join('');
-        }
-        lucide.createIcons();
+        renderOverviewResults(resultsData);
     } catch (err) {
         console.error('Overview error:', err);
     }
@@ -245,58 +261,147 @@ document.getElementById('add-voter-form').addEventListener('submit', async (e) =
 
 // ─── Results ────────────────────────────────────────────────────────
 
+function renderResults(data) {
+    const stats = data.stats;
+
+    // Turnout ring
+    const circumference = 2 * Math.PI * 70; // ~440
+    const offset = circumference - (stats.turnout / 100) * circumference;
+    document.getElementById('turnout-ring-fill').style.strokeDashoffset = offset;
+    document.getElementById('turnout-percent').textContent = stats.turnout + '%';
+    document.getElementById('result-voted').textContent = stats.voted;
+    document.getElementById('result-registered').textContent = stats.total_voters;
+    document.getElementById('result-total-votes').textContent = stats.total_votes;
+
+    document.getElementById('results-container').innerHTML =
+        resultCardsHtml(data.results, 'No votes recorded yet');
+    lucide.createIcons();
+}
+
 async function loadResults() {
     try {
-        const data = await apiRequest('/api/admin/results');
-        const stats = data.stats;
-
-        // Turnout ring
-        const circumference = 2 * Math.PI * 70; // ~440
-        const offset = circumference - (stats.turnout / 100) * circumference;
-        document.getElementById('turnout-ring-fill').style.strokeDashoffset = offset;
-        document.getElementById('turnout-percent').textContent = stats.turnout + '%';
-        document.getElementById('result-voted').textContent = stats.voted;
-        document.getElementById('result-registered').textContent = stats.total_voters;
-        document.getElementById('result-total-votes').textContent = stats.total_votes;
-
-        const container = document.getElementById('results-container');
-        if (data.results.length === 0) {
-            container.innerHTML = `
-                <div class="glass-card text-center text-muted" style="padding:48px; grid-column:1/-1;">
-                    <i data-lucide="inbox" style="width:32px;height:32px;margin-bottom:12px;opacity:0.4;"></i>
-                    <p>No votes recorded yet</p>
-                </div>`;
-        } else {
-            container.innerHTML = data.results.map(r => `
-                <div class="glass-card result-card">
-                    <div class="r-header">
-                        <div class="r-avatar">${r.name.charAt(0)}</div>
-                        <div>
-                            <div class="r-name">${r.name}</div>
-                            <div class="r-party">${r.party}</div>
-                        </div>
-                    </div>
-                    <div class="vote-bar">
-                        <div class="vote-bar-fill" style="width:${r.percentage}%"></div>
-                    </div>
-                    <div class="r-stats">
-                        <span class="count">${r.vote_count} votes</span>
-                        <span>${r.percentage}%</span>
-                    </div>
-                </div>
-            `).join('');
-        }
-        lucide.createIcons();
+        latestResults = await apiRequest('/api/admin/results');
+        renderResults(latestResults);
     } catch (err) {
         console.error('Results error:', err);
     }
 }
 
+// ─── Live Updates (Server-Sent Events) ──────────────────────────────
+
+function applyTally(tally) {
+    if (!latestResults) return;
+    const stats = latestResults.stats;
+    const candidate = latestResults.results.find(r => r.name === tally.candidate);
+    if (!candidate) return loadResults();
+
+    candidate.vote_count += tally.delta;
+    stats.voted += tally.delta;
+    stats.total_votes += tally.delta;
+    stats.turnout = stats.total_voters ? Math.round(stats.voted / stats.total_voters * 10000) / 100 : 0;
+    latestResults.results.sort((a, b) => b.vote_count - a.vote_count);
+    latestResults.results.forEach(r => {
+        r.percentage = stats.total_votes ? Math.round(r.vote_count / stats.total_votes * 10000) / 100 : 0;
+    });
+
+    renderOverviewResults(latestResults);
+    renderResults(latestResults);
+}
+
+function startLiveUpdates() {
+    if (resultsStream) return;
+    resultsStream = new EventSource(API + '/api/admin/stream');
+    resultsStream.addEventListener('tally', (e) => applyTally(JSON.parse(e.data)));
+    resultsStream.addEventListener('reset', () => loadResults());
+    resultsStream.addEventListener('block', (e) => {
+        if (!document.getElementById('panel-blockchain').classList.contains('active')) return;
+        document.getElementById('chain-blocks').insertAdjacentHTML('afterbegin', renderBlock(JSON.parse(e.data)));
+        lucide.createIcons();
+    });
+    resultsResync = setInterval(loadResults, RESULTS_RESYNC_MS);
+}
+
+function stopLiveUpdates() {
+    if (resultsStream) resultsStream.close();
+    resultsStream = null;
+    clearInterval(resultsResync);
+    resultsResync = null;
+}
+
 // ─── Blockchain ─────────────────────────────────────────────────────
 
+function renderBlock(block) {
+    const type = block.data.type;
+    const badge = {
+        genesis: { cls: 'badge-warning', icon: 'flag', label: 'Genesis' },
+        vote: { cls: 'badge-success', icon: 'check-square', label: 'Vote' },
+        batch: { cls: 'badge-success', icon: 'layers', label: `Batch · ${block.data.vote_count} votes` }
+    }[type] || { cls: 'badge-info', icon: 'box', label: type };
+
+    return `
+        <div class="glass-card block-item">
+            <div class="b-header">
+                <div class="b-badges">
+                    <span class="badge ${badge.cls}">
+                        <i data-lucide="${badge.icon}"></i>
+                        ${badge.label}
+                    </span>
+                    <span class="badge badge-indigo">
+                        <i data-lucide="hash"></i> Block ${block.index}
+                    </span>
+                </div>
+                <span class="b-time">${new Date(block.timestamp * 1000).toLocaleString()}</span>
+            </div>
+            ${type === 'vote' ? `
+                <div class="b-vote-info">
+                    <i data-lucide="user"></i>
+                    <strong>${block.data.voter_id}</strong>
+                    <i data-lucide="arrow-right"></i>
+                    <strong>${block.data.candidate}</strong>
+                </div>
+            ` : ''}
+            ${type === 'batch' ? `
+                <div class="b-vote-info">
+                    <i data-lucide="git-merge"></i>
+                    Merkle root <strong>${block.data.merkle_root.slice(0, 16)}…</strong>
+                </div>
+            ` : ''}
+            <div class="b-hash">${block.hash}</div>
+        </div>
+    `;
+}
+
+function renderBlockPage(page, append) {
+    const container = document.getElementById('chain-blocks');
+    const html = page.chain.map(renderBlock).join('');
+    document.getElementById('load-more-blocks')?.remove();
+
+    if (append) container.insertAdjacentHTML('beforeend', html);
+    else container.innerHTML = html;
+
+    nextBlockCursor = page.next_cursor;
+    if (nextBlockCursor !== null) {
+        container.insertAdjacentHTML('beforeend', `
+            <button class="btn btn-secondary btn-sm" id="load-more-blocks" onclick="loadMoreBlocks()">
+                <i data-lucide="chevrons-down"></i> Load older blocks
+            </button>
+        `);
+    }
+    lucide.createIcons();
+}
+
+async function loadMoreBlocks() {
+    try {
+        const page = await apiRequest(`/api/blockchain/blocks?order=desc&cursor=${nextBlockCursor}`);
+        renderBlockPage(page, true);
+    } catch (err) {
+        console.error('Blockchain page error:', err);
+    }
+}
+
 async function loadBlockchain() {
     try {
-        const data = await apiRequest('/api/blockchain/validate');
+        const data = await apiRequest('/api/blockchain/validate?order=desc');
 
         document.getElementById('chain-status').innerHTML = `
             <div class="glass-card no-hover" style="margin-bottom:16px;">
@@ -337,33 +442,7 @@ async function loadBlockchain() {
             </div>
         `;
 
-        document.getElementById('chain-blocks').innerHTML = data.chain.slice().reverse().map(block => `
-            <div class="glass-card block-item">
-                <div class="b-header">
-                    <div class="b-badges">
-                        <span class="badge ${block.data.type === 'genesis' ? 'badge-warning' : 'badge-success'}">
-                            <i data-lucide="${block.data.type === 'genesis' ? 'flag' : 'check-square'}"></i>
-                            ${block.data.type === 'genesis' ? 'Genesis' : 'Vote'}
-                        </span>
-                        <span class="badge badge-indigo">
-                            <i data-lucide="hash"></i> Block ${block.index}
-                        </span>
-                    </div>
-                    <span class="b-time">${new Date(block.timestamp * 1000).toLocaleString()}</span>
-                </div>
-                ${block.data.type === 'vote' ? `
-                    <div class="b-vote-info">
-                        <i data-lucide="user"></i>
-                        <strong>${block.data.voter_id}</strong>
-                        <i data-lucide="arrow-right"></i>
-                        <strong>${block.data.candidate}</strong>
-                    </div>
-                ` : ''}
-                <div class="b-hash">${block.hash}</div>
-            </div>
-        `).join('');
-
-        lucide.createIcons();
+        renderBlockPage(data, false);
     } catch (err) {
         console.error('Blockchain error:', err);
         document.getElementById('chain-status').innerHTML = `
@@ -10,6 +10,9 @@ const API = '';
 // ─── State ──────────────────────────────────────────────────────────
 let currentVoter = null;
 let selectedCandidate = null;
+// Sent with the vote so resubmitting after a lost reply returns the
+// same ticket instead of a duplicate-vote error
+let voteIdempotencyKey = null;
 
 // ─── Helpers ────────────────────────────────────────────────────────
 
@@ -85,19 +88,32 @@ async function showAlreadyVoted() {
 
         if (data.verified) {
             const block = data.block;
+            // Batch blocks hold the vote as a Merkle-proven leaf, not in data
+            const batch = block.data.type === 'batch';
+            const vote = batch ? block.vote : block.data;
             document.getElementById('existing-vote-info').innerHTML = `
                 <div class="detail-row">
                     <span class="d-label">Voter ID</span>
-                    <span class="d-value">${block.data.voter_id}</span>
+                    <span class="d-value">${vote.voter_id}</span>
                 </div>
                 <div class="detail-row">
                     <span class="d-label">Candidate</span>
-                    <span class="d-value">${block.data.candidate}</span>
+                    <span class="d-value">${vote.candidate}</span>
                 </div>
                 <div class="detail-row">
                     <span class="d-label">Block Hash</span>
                     <span class="d-value" style="font-family:'JetBrains Mono',monospace;font-size:0.68rem;color:var(--cyan-400);word-break:break-all;">${block.hash}</span>
                 </div>
+                ${batch ? `
+                    <div class="detail-row">
+                        <span class="d-label">Merkle Root</span>
+                        <span class="d-value"><i data-lucide="git-merge"></i> <strong>${block.merkle_root.slice(0, 16)}…</strong></span>
+                    </div>
+                    <div class="detail-row">
+                        <span class="d-label">Merkle Proof</span>
+                        <span class="d-value">${block.proof.length} ${block.proof.length === 1 ? 'step' : 'steps'} to the root</span>
+                    </div>
+                ` : ''}
                 <div class="detail-row">
                     <span class="d-label">Chain Status</span>
                     <span class="d-value">
@@ -151,11 +167,38 @@ function selectCandidate(element, name) {
     document.querySelectorAll('.candidate-option').forEach(el => el.classList.remove('selected'));
     element.classList.add('selected');
     selectedCandidate = name;
+    voteIdempotencyKey = null;
     document.getElementById('submit-vote-btn').disabled = false;
 }
 
 // ─── Step 3: Submit Vote ────────────────────────────────────────────
 
+function newIdempotencyKey() {
+    if (window.crypto && crypto.randomUUID) return crypto.randomUUID();
+    return Date.now().toString(36) + Math.random().toString(36).slice(2);
+}
+
+// Accept mode: the vote was queued (202); poll its ticket for the receipt,
+// giving up after TICKET_WAIT_MS
+const TICKET_WAIT_MS = 120000;
+
+async function waitForTicket(url) {
+    const deadline = Date.now() + TICKET_WAIT_MS;
+    while (true) {
+        const res = await fetch(API + url);
+        const ticket = await res.json();
+        if (!res.ok) throw new Error(ticket.error || 'Could not check vote status');
+        if (ticket.status === 'committed') return ticket;
+        if (ticket.status === 'rejected') throw new Error(ticket.error);
+        const seconds = Number(res.headers.get('Retry-After')) || 1;
+        if (Date.now() + seconds * 1000 > deadline) {
+            throw new Error('Your vote was accepted but is taking longer than usual to be recorded. ' +
+                            'Log in again later to see your receipt.');
+        }
+        await new Promise(resolve => setTimeout(resolve, seconds * 1000));
+    }
+}
+
 document.getElementById('submit-vote-btn').addEventListener('click', () => {
     if (!selectedCandidate) return;
     document.getElementById('confirm-candidate-name').textContent = selectedCandidate;
@@ -171,18 +214,27 @@ document.getElementById('confirm-vote-btn').addEventListener('click', async () =
     confirmBtn.disabled = true;
     confirmBtn.innerHTML = '<span class="spinner"></span> Mining block…';
 
+    voteIdempotencyKey = voteIdempotencyKey || newIdempotencyKey();
+
     try {
         const res = await fetch(API + '/api/vote', {
             method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
+            headers: {
+                'Content-Type': 'application/json',
+                'Idempotency-Key': voteIdempotencyKey
+            },
             body: JSON.stringify({
                 voter_id: currentVoter.voter_id,
                 candidate_name: selectedCandidate
             })
         });
 
-        const data = await res.json();
+        let data = await res.json();
         if (!res.ok) throw new Error(data.error || 'Vote failed');
+        if (res.status === 202) {
+            confirmBtn.innerHTML = '<span class="spinner"></span> Vote accepted, awaiting block…';
+            data = await waitForTicket(data.status_url);
+        }
 
         document.getElementById('confirm-modal').classList.remove('active');
 
@@ -0,0 +1,643 @@
+"""
+Storage Backends
+Data access for voters, candidates, votes, vote tickets and admins
+behind one interface, so the app can run against hosted Supabase or a local SQLite
+database with no outside service.
+
+STORAGE_BACKEND selects the backend:
+  supabase  (default) SUPABASE_URL / SUPABASE_ANON_KEY, over one pooled
+            keep-alive (HTTP/2) client per process: DB_POOL_SIZE,
+            DB_TIMEOUT, DB_CONNECT_TIMEOUT, DB_HTTP2
+  sqlite    SQLITE_PATH (default blockvote.db), WAL mode, for single-node
+            deployments, tests, benchmarks and load tests
+
+Calls block the calling thread; under gunicorn's gevent worker they
+yield to other requests while waiting on the network, and concurrently()
+overlaps independent lookups within one request.
+"""
+
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import httpx
+from postgrest import SyncPostgrestClient
+from postgrest.exceptions import APIError
+from postgrest.types import CountMethod, ReturnMethod
+from postgrest.utils import SyncClient
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+# Voter IDs per `in.(...)` filter, keeping request URLs short
+IN_FILTER_CHUNK = 200
+
+
+class AlreadyExists(Exception):
+    """Raised when inserting a voter or candidate that is already registered."""
+
+
+def create_storage():
+    """Build the storage backend selected by the environment."""
+    backend = os.getenv('STORAGE_BACKEND', 'supabase')
+    if backend == 'supabase':
+        return SupabaseStorage(
+            os.getenv('SUPABASE_URL'),
+            os.getenv('SUPABASE_ANON_KEY'),
+            pool_size=int(os.getenv('DB_POOL_SIZE', '20')),
+            timeout=float(os.getenv('DB_TIMEOUT', '10')),
+            connect_timeout=float(os.getenv('DB_CONNECT_TIMEOUT', '5')),
+            http2=os.getenv('DB_HTTP2', '1').lower() in ('1', 'true', 'yes')
+        )
+    if backend == 'sqlite':
+        return SQLiteStorage(os.getenv('SQLITE_PATH', 'blockvote.db'))
+    raise ValueError(f'Unknown STORAGE_BACKEND: {backend} (use supabase or sqlite)')
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def concurrently(*calls):
+    """
+    Run independent zero-argument storage calls at the same time and
+    return their results in order. Under gevent the pool's threads are
+    greenlets, so this costs no extra OS threads.
+    """
+    global _executor
+    if len(calls) < 2:
+        return [call() for call in calls]
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=int(os.getenv('DB_POOL_SIZE', '20')),
+                                           thread_name_prefix='storage')
+    futures = [_executor.submit(call) for call in calls]
+    return [f.result() for f in futures]
+
+
+# ─── Supabase ─────────────────────────────────────────────────────────
+
+class _PooledPostgrestClient(SyncPostgrestClient):
+    """PostgREST client that runs on a shared, pre-built HTTP session."""
+
+    def __init__(self, base_url, *, session, **kwargs):
+        self._shared_session = session
+        super().__init__(base_url, **kwargs)
+
+    def create_session(self, base_url, headers, timeout):
+        # Carry this client's headers (e.g. a new auth token) over to the
+        # shared session instead of opening another connection pool
+        session = self._shared_session
+        session.base_url = base_url
+        session.headers = headers
+        session.timeout = timeout
+        return session
+
+
+class SupabaseStorage:
+    """
+    Hosted Postgres via the Supabase client (see supabase_setup.sql).
+    All PostgREST calls share one keep-alive connection pool of
+    `pool_size` connections, multiplexed over HTTP/2 when enabled.
+    """
+
+    def __init__(self, url, key, pool_size=20, timeout=10.0, connect_timeout=5.0, http2=True):
+        from supabase import create_client
+        self.client = create_client(url, key)
+
+        limits = httpx.Limits(max_connections=pool_size,
+                              max_keepalive_connections=pool_size,
+                              keepalive_expiry=60.0)
+        pool_timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.session = SyncClient(limits=limits, http2=http2, timeout=pool_timeout)
+
+        # The client rebuilds its PostgREST client after auth events;
+        # every rebuild reuses the one pooled session.
+        def init_postgrest(rest_url, headers, schema, timeout=None):
+            return _PooledPostgrestClient(rest_url, headers=headers, schema=schema,
+                                          timeout=pool_timeout, session=self.session)
+        self.client._init_postgrest_client = init_postgrest
+
+    def _insert_unique(self, table, row):
+        try:
+            return self.client.table(table).insert(row).execute().data[0]
+        except APIError as e:
+            if e.code == '23505':
+                raise AlreadyExists(f'{table} row already exists') from e
+            raise
+
+    # Admins
+
+    def admin_login(self, email, password):
+        """Return (admin row, access token); PermissionError if not an admin."""
+        auth_response = self.client.auth.sign_in_with_password({
+            'email': email,
+            'password': password
+        })
+        admin_check = self.client.table('admins').select('*') \
+            .eq('user_id', auth_response.user.id).execute()
+        if not admin_check.data:
+            raise PermissionError('Not authorized as admin')
+        return admin_check.data[0], auth_response.session.access_token
+
+    def create_admin(self, email, password, role='super_admin'):
+        auth_response = self.client.auth.sign_up({
+            'email': email,
+            'password': password,
+            'options': {'data': {'role': 'admin'}}
+        })
+        return self.client.table('admins').insert({
+            'user_id': auth_response.user.id,
+            'email': email,
+            'role': role
+        }).execute().data[0]
+
+    # Voters
+
+    def get_voter(self, voter_id):
+        result = self.client.table('voters').select('*').eq('voter_id', voter_id).execute()
+        return result.data[0] if result.data else None
+
+    def list_voters(self):
+        return self.client.table('voters').select('*').order('created_at', desc=False).execute().data
+
+    def add_voter(self, voter_id, name, email):
+        return self._insert_unique('voters', {
+            'voter_id': voter_id,
+            'name': name,
+            'email': email,
+            'has_voted': False
+        })
+
+    def bulk_add_voters(self, voters):
+        """Insert many voters, skipping existing voter IDs. Returns the inserted count."""
+        result = self.client.table('voters').upsert(
+            voters,
+            on_conflict='voter_id',
+            ignore_duplicates=True,
+            count=CountMethod.exact,
+            returning=ReturnMethod.minimal
+        ).execute()
+        return result.count if result.count is not None else len(result.data)
+
+    def turnout(self):
+        return self.client.rpc('election_turnout', {}).execute().data
+
+    # Candidates
+
+    def list_candidates(self):
+        return self.client.table('candidates').select('*').order('created_at', desc=False).execute().data
+
+    def public_candidates(self):
+        return self.client.table('candidates').select('id, name, party, description').execute().data
+
+    def add_candidate(self, name, party, description=''):
+        return self._insert_unique('candidates', {
+            'name': name,
+            'party': party,
+            'description': description,
+            'vote_count': 0
+        })
+
+    def bulk_add_candidates(self, candidates):
+        self.client.table('candidates').upsert(
+            candidates, on_conflict='name', ignore_duplicates=True
+        ).execute()
+
+    def candidate_results(self):
+        return self.client.table('candidates').select('name, party, vote_count') \
+            .order('vote_count', desc=True).execute().data
+
+    # Votes
+
+    def check_vote_eligibility(self, voter_id, candidate_name):
+        return self.client.rpc('check_vote_eligibility', {
+            'p_voter_id': voter_id,
+            'p_candidate_name': candidate_name
+        }).execute().data
+
+    def commit_vote(self, voter_id, candidate_name, block_hash, previous_hash, timestamp):
+        """Atomically record a vote. Returns 'ok' or the refusal status."""
+        return self.client.rpc('commit_vote', {
+            'p_voter_id': voter_id,
+            'p_candidate_name': candidate_name,
+            'p_block_hash': block_hash,
+            'p_previous_hash': previous_hash,
+            'p_timestamp': timestamp
+        }).execute().data['status']
+
+    def commit_votes(self, votes):
+        """commit_vote for a batch of vote dicts in one round-trip; returns their statuses."""
+        return self.client.rpc('commit_votes', {'p_votes': votes}).execute().data
+
+    def vote_tallies(self):
+        """Votes per candidate counted from the votes table."""
+        return self.client.rpc('vote_tallies', {}).execute().data or {}
+
+    def get_votes(self, voter_ids):
+        """Vote rows for the given voter IDs (missing voters are omitted)."""
+        rows = []
+        for i in range(0, len(voter_ids), IN_FILTER_CHUNK):
+            rows += self.client.table('votes').select('voter_id, candidate_name, block_hash') \
+                .in_('voter_id', voter_ids[i:i + IN_FILTER_CHUNK]).execute().data
+        return rows
+
+    def iter_votes(self, since=None, page_size=1000):
+        """Yield pages of vote rows created at or after `since`, keyset-paged by id."""
+        last_id = None
+        while True:
+            query = self.client.table('votes') \
+                .select('id, voter_id, candidate_name, block_hash, created_at')
+            if since:
+                query = query.gte('created_at', since)
+            if last_id:
+                query = query.gt('id', last_id)
+            page = query.order('id').limit(page_size).execute().data
+            if page:
+                yield page
+            if len(page) < page_size:
+                return
+            last_id = page[-1]['id']
+
+    # Vote tickets
+
+    def enqueue_vote(self, voter_id, candidate_name, idempotency_key=None):
+        """
+        Durably accept a vote for the commit pipeline. Returns (ticket,
+        created); a repeated idempotency key returns the existing ticket.
+        Raises AlreadyExists if the voter already has a ticket.
+        """
+        try:
+            return self._insert_unique('vote_tickets', {
+                'voter_id': voter_id,
+                'candidate_name': candidate_name,
+                'idempotency_key': idempotency_key
+            }), True
+        except AlreadyExists:
+            existing = idempotency_key and self.get_ticket_by_key(idempotency_key)
+            if existing:
+                return existing, False
+            raise
+
+    def get_ticket(self, ticket_id):
+        result = self.client.table('vote_tickets').select('*').eq('id', ticket_id).execute()
+        return result.data[0] if result.data else None
+
+    def get_ticket_by_key(self, idempotency_key):
+        result = self.client.table('vote_tickets').select('*') \
+            .eq('idempotency_key', idempotency_key).execute()
+        return result.data[0] if result.data else None
+
+    def claim_tickets(self, limit, lease_seconds):
+        """Lease up to `limit` pending tickets, oldest first, to this caller."""
+        return self.client.rpc('claim_vote_tickets', {
+            'p_limit': limit,
+            'p_lease_seconds': lease_seconds
+        }).execute().data
+
+    def finish_tickets(self, tickets):
+        """Store the final status, receipt and error of claimed tickets."""
+        if tickets:
+            self.client.rpc('finish_vote_tickets', {'p_tickets': tickets}).execute()
+
+
+# ─── SQLite ───────────────────────────────────────────────────────────
+
+SQLITE_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS voters (
+    id          TEXT PRIMARY KEY,
+    voter_id    TEXT UNIQUE NOT NULL,
+    name        TEXT NOT NULL,
+    email       TEXT NOT NULL,
+    has_voted   INTEGER NOT NULL DEFAULT 0,
+    created_at  TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS admins (
+    id            TEXT PRIMARY KEY,
+    email         TEXT UNIQUE NOT NULL,
+    password_hash TEXT NOT NULL,
+    role          TEXT NOT NULL DEFAULT 'admin',
+    created_at    TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS candidates (
+    id          TEXT PRIMARY KEY,
+    name        TEXT UNIQUE NOT NULL,
+    party       TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    vote_count  INTEGER NOT NULL DEFAULT 0,
+    created_at  TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS votes (
+    id              TEXT PRIMARY KEY,
+    voter_id        TEXT UNIQUE NOT NULL REFERENCES voters(voter_id),
+    candidate_name  TEXT NOT NULL,
+    block_hash      TEXT NOT NULL,
+    previous_hash   TEXT NOT NULL,
+    timestamp       REAL NOT NULL,
+    created_at      TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS vote_tickets (
+    id               TEXT PRIMARY KEY,
+    idempotency_key  TEXT UNIQUE,
+    voter_id         TEXT UNIQUE NOT NULL REFERENCES voters(voter_id),
+    candidate_name   TEXT NOT NULL,
+    status           TEXT NOT NULL DEFAULT 'pending',
+    receipt          TEXT,
+    error            TEXT,
+    attempts         INTEGER NOT NULL DEFAULT 0,
+    claimed_until    REAL NOT NULL DEFAULT 0,
+    created_at       TEXT NOT NULL,
+    updated_at       TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_voters_has_voted ON voters(has_voted);
+CREATE INDEX IF NOT EXISTS idx_votes_created_at ON votes(created_at);
+CREATE INDEX IF NOT EXISTS idx_vote_tickets_pending ON vote_tickets(status, created_at);
+'''
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _voter_row(row):
+    voter = dict(row)
+    voter['has_voted'] = bool(voter['has_voted'])
+    return voter
+
+
+def _ticket_row(row):
+    ticket = dict(row)
+    ticket['receipt'] = json.loads(ticket['receipt']) if ticket['receipt'] else None
+    return ticket
+
+
+class SQLiteStorage:
+    """
+    Local SQLite database in WAL mode. Each thread gets its own
+    connection; vote commits run in an IMMEDIATE transaction so the
+    eligibility re-check and counter increment are atomic.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.executescript(SQLITE_SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None,
+                                   check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA foreign_keys=ON')
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self, mode=''):
+        """
+        Run the with-block in one transaction on this thread's connection,
+        rolled back if it raises so the connection never stays mid-transaction.
+        """
+        conn = self._conn()
+        conn.execute(f'BEGIN {mode}')
+        try:
+            yield conn
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    def _insert_unique(self, table, row):
+        row = {'id': str(uuid.uuid4()), 'created_at': _now(), **row}
+        columns = ', '.join(row)
+        placeholders = ', '.join('?' for _ in row)
+        try:
+            self._conn().execute(f'INSERT INTO {table} ({columns}) VALUES ({placeholders})',
+                                 list(row.values()))
+        except sqlite3.IntegrityError as e:
+            raise AlreadyExists(f'{table} row already exists') from e
+        return row
+
+    # Admins
+
+    def admin_login(self, email, password):
+        row = self._conn().execute('SELECT * FROM admins WHERE email = ?', (email,)).fetchone()
+        if row is None or not check_password_hash(row['password_hash'], password):
+            raise ValueError('Invalid login credentials')
+        admin = {k: row[k] for k in row.keys() if k != 'password_hash'}
+        return admin, secrets.token_urlsafe(32)
+
+    def create_admin(self, email, password, role='super_admin'):
+        admin = self._insert_unique('admins', {
+            'email': email,
+            'password_hash': generate_password_hash(password),
+            'role': role
+        })
+        del admin['password_hash']
+        return admin
+
+    # Voters
+
+    def get_voter(self, voter_id):
+        row = self._conn().execute('SELECT * FROM voters WHERE voter_id = ?', (voter_id,)).fetchone()
+        return _voter_row(row) if row else None
+
+    def list_voters(self):
+        rows = self._conn().execute('SELECT * FROM voters ORDER BY created_at').fetchall()
+        return [_voter_row(r) for r in rows]
+
+    def add_voter(self, voter_id, name, email):
+        voter = self._insert_unique('voters', {
+            'voter_id': voter_id,
+            'name': name,
+            'email': email,
+            'has_voted': 0
+        })
+        return _voter_row(voter)
+
+    def bulk_add_voters(self, voters):
+        created_at = _now()
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                'INSERT OR IGNORE INTO voters (id, voter_id, name, email, has_voted, created_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                [(str(uuid.uuid4()), v['voter_id'], v['name'], v['email'],
+                  int(v.get('has_voted', False)), created_at) for v in voters]
+            )
+            return conn.total_changes - before
+
+    def turnout(self):
+        row = self._conn().execute(
+            'SELECT COUNT(*), COALESCE(SUM(has_voted), 0) FROM voters'
+        ).fetchone()
+        return {'total_voters': row[0], 'voted': row[1]}
+
+    # Candidates
+
+    def list_candidates(self):
+        rows = self._conn().execute('SELECT * FROM candidates ORDER BY created_at').fetchall()
+        return [dict(r) for r in rows]
+
+    def public_candidates(self):
+        rows = self._conn().execute('SELECT id, name, party, description FROM candidates').fetchall()
+        return [dict(r) for r in rows]
+
+    def add_candidate(self, name, party, description=''):
+        return self._insert_unique('candidates', {
+            'name': name,
+            'party': party,
+            'description': description,
+            'vote_count': 0
+        })
+
+    def bulk_add_candidates(self, candidates):
+        created_at = _now()
+        with self._transaction() as conn:
+            conn.executemany(
+                'INSERT OR IGNORE INTO candidates (id, name, party, description, vote_count, created_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                [(str(uuid.uuid4()), c['name'], c['party'], c.get('description', ''),
+                  c.get('vote_count', 0), created_at) for c in candidates]
+            )
+
+    def candidate_results(self):
+        rows = self._conn().execute(
+            'SELECT name, party, vote_count FROM candidates ORDER BY vote_count DESC'
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+    # Votes
+
+    def check_vote_eligibility(self, voter_id, candidate_name):
+        conn = self._conn()
+        voter = conn.execute('SELECT has_voted FROM voters WHERE voter_id = ?', (voter_id,)).fetchone()
+        candidate = conn.execute('SELECT 1 FROM candidates WHERE name = ?', (candidate_name,)).fetchone()
+        return {
+            'voter_found': voter is not None,
+            'has_voted': bool(voter and voter['has_voted']),
+            'candidate_found': candidate is not None
+        }
+
+    @staticmethod
+    def _commit_vote(conn, voter_id, candidate_name, block_hash, previous_hash, timestamp):
+        voter = conn.execute('SELECT has_voted FROM voters WHERE voter_id = ?', (voter_id,)).fetchone()
+        if voter is None:
+            return 'voter_not_found'
+        if voter['has_voted']:
+            return 'already_voted'
+        if conn.execute('UPDATE candidates SET vote_count = vote_count + 1 WHERE name = ?',
+                        (candidate_name,)).rowcount == 0:
+            return 'candidate_not_found'
+        conn.execute(
+            'INSERT INTO votes (id, voter_id, candidate_name, block_hash, previous_hash, '
+            'timestamp, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (str(uuid.uuid4()), voter_id, candidate_name, block_hash, previous_hash,
+             timestamp, _now())
+        )
+        conn.execute('UPDATE voters SET has_voted = 1 WHERE voter_id = ?', (voter_id,))
+        return 'ok'
+
+    def commit_vote(self, voter_id, candidate_name, block_hash, previous_hash, timestamp):
+        return self.commit_votes([{
+            'voter_id': voter_id,
+            'candidate_name': candidate_name,
+            'block_hash': block_hash,
+            'previous_hash': previous_hash,
+            'timestamp': timestamp
+        }])[0]
+
+    def commit_votes(self, votes):
+        with self._transaction('IMMEDIATE') as conn:
+            return [self._commit_vote(conn, v['voter_id'], v['candidate_name'], v['block_hash'],
+                                      v['previous_hash'], v['timestamp']) for v in votes]
+
+    def vote_tallies(self):
+        rows = self._conn().execute(
+            'SELECT candidate_name, COUNT(*) FROM votes GROUP BY candidate_name'
+        ).fetchall()
+        return {name: count for name, count in rows}
+
+    def get_votes(self, voter_ids):
+        rows = []
+        conn = self._conn()
+        # Stay under SQLite's bound-parameter limit
+        for i in range(0, len(voter_ids), 500):
+            chunk = voter_ids[i:i + 500]
+            rows += conn.execute(
+                'SELECT voter_id, candidate_name, block_hash FROM votes '
+                f'WHERE voter_id IN ({", ".join("?" for _ in chunk)})', chunk
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def iter_votes(self, since=None, page_size=1000):
+        last_id = ''
+        while True:
+            page = [dict(r) for r in self._conn().execute(
+                'SELECT id, voter_id, candidate_name, block_hash, created_at FROM votes '
+                'WHERE created_at >= ? AND id > ? ORDER BY id LIMIT ?',
+                (since or '', last_id, page_size)
+            ).fetchall()]
+            if page:
+                yield page
+            if len(page) < page_size:
+                return
+            last_id = page[-1]['id']
+
+    # Vote tickets
+
+    def enqueue_vote(self, voter_id, candidate_name, idempotency_key=None):
+        try:
+            ticket = self._insert_unique('vote_tickets', {
+                'idempotency_key': idempotency_key,
+                'voter_id': voter_id,
+                'candidate_name': candidate_name,
+                'status': 'pending'
+            })
+        except AlreadyExists:
+            existing = idempotency_key and self.get_ticket_by_key(idempotency_key)
+            if existing:
+                return existing, False
+            raise
+        return {**ticket, 'receipt': None, 'error': None, 'attempts': 0}, True
+
+    def get_ticket(self, ticket_id):
+        row = self._conn().execute('SELECT * FROM vote_tickets WHERE id = ?', (ticket_id,)).fetchone()
+        return _ticket_row(row) if row else None
+
+    def get_ticket_by_key(self, idempotency_key):
+        row = self._conn().execute('SELECT * FROM vote_tickets WHERE idempotency_key = ?',
+                                   (idempotency_key,)).fetchone()
+        return _ticket_row(row) if row else None
+
+    def claim_tickets(self, limit, lease_seconds):
+        now = time.time()
+        rows = self._conn().execute(
+            'UPDATE vote_tickets SET claimed_until = ?, attempts = attempts + 1 '
+            "WHERE id IN (SELECT id FROM vote_tickets WHERE status = 'pending' "
+            'AND claimed_until < ? ORDER BY created_at LIMIT ?) RETURNING *',
+            (now + lease_seconds, now, limit)
+        ).fetchall()
+        return sorted((_ticket_row(r) for r in rows), key=lambda t: t['created_at'])
+
+    def finish_tickets(self, tickets):
+        if not tickets:
+            return
+        updated_at = _now()
+        with self._transaction() as conn:
+            conn.executemany(
+                'UPDATE vote_tickets SET status = ?, receipt = ?, error = ?, claimed_until = 0, '
+                'updated_at = ? WHERE id = ?',
+                [(t['status'], json.dumps(t['receipt']) if t['receipt'] else None, t['error'],
+                  updated_at, t['id']) for t in tickets]
+            )
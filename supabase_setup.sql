@@ -107,6 +107,183 @@ CREATE POLICY "Allow insert admins"
     ON admins FOR INSERT
     WITH CHECK (true);
 
+-- ── Vote Functions (RPC) ─────────────────────────────────────────
+
+-- One round-trip pre-check: does the voter exist, have they voted,
+-- and does the candidate exist?
+CREATE OR REPLACE FUNCTION check_vote_eligibility(
+    p_voter_id       TEXT,
+    p_candidate_name TEXT
+)
+RETURNS JSON
+LANGUAGE sql STABLE
+AS $$
+    SELECT json_build_object(
+        'voter_found',     EXISTS (SELECT 1 FROM voters WHERE voter_id = p_voter_id),
+        'has_voted',       COALESCE((SELECT has_voted FROM voters WHERE voter_id = p_voter_id), FALSE),
+        'candidate_found', EXISTS (SELECT 1 FROM candidates WHERE name = p_candidate_name)
+    );
+$$;
+
+-- Atomically record a mined vote: re-checks the voter under a row lock,
+-- increments the candidate counter in place (no lost updates), inserts
+-- the vote and marks the voter. Returns {"status": "ok"} or the reason
+-- the vote was refused, in which case nothing is written.
+CREATE OR REPLACE FUNCTION commit_vote(
+    p_voter_id       TEXT,
+    p_candidate_name TEXT,
+    p_block_hash     TEXT,
+    p_previous_hash  TEXT,
+    p_timestamp      FLOAT
+)
+RETURNS JSON
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_has_voted BOOLEAN;
+BEGIN
+    SELECT has_voted INTO v_has_voted
+    FROM voters WHERE voter_id = p_voter_id
+    FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RETURN json_build_object('status', 'voter_not_found');
+    END IF;
+    IF v_has_voted THEN
+        RETURN json_build_object('status', 'already_voted');
+    END IF;
+
+    UPDATE candidates SET vote_count = vote_count + 1 WHERE name = p_candidate_name;
+    IF NOT FOUND THEN
+        RETURN json_build_object('status', 'candidate_not_found');
+    END IF;
+
+    INSERT INTO votes (voter_id, candidate_name, block_hash, previous_hash, timestamp)
+    VALUES (p_voter_id, p_candidate_name, p_block_hash, p_previous_hash, p_timestamp);
+
+    UPDATE voters SET has_voted = TRUE WHERE voter_id = p_voter_id;
+
+    RETURN json_build_object('status', 'ok');
+END;
+$$;
+
+-- Turnout aggregates for the results dashboard, computed server-side
+-- so the API never downloads voter rows just to count them.
+CREATE OR REPLACE FUNCTION election_turnout()
+RETURNS JSON
+LANGUAGE sql STABLE
+AS $$
+    SELECT json_build_object(
+        'total_voters', COUNT(*),
+        'voted',        COUNT(*) FILTER (WHERE has_voted)
+    )
+    FROM voters;
+$$;
+
+CREATE INDEX IF NOT EXISTS idx_voters_has_voted ON voters(has_voted);
+
+-- Per-candidate counts from the votes table, for reconcile.py to
+-- compare against the chain and the candidates.vote_count counters.
+CREATE OR REPLACE FUNCTION vote_tallies()
+RETURNS JSON
+LANGUAGE sql STABLE
+AS $$
+    SELECT COALESCE(json_object_agg(candidate_name, n), '{}'::json)
+    FROM (SELECT candidate_name, COUNT(*) AS n FROM votes GROUP BY candidate_name) t;
+$$;
+
+-- Incremental reconciliation pages through votes created since its last run
+CREATE INDEX IF NOT EXISTS idx_votes_created_at ON votes(created_at);
+
+-- ── Vote Tickets (accept-then-commit voting) ─────────────────────
+-- /api/vote can store a validated vote here and answer 202 at once;
+-- pipeline.py mines and commits pending tickets in batches and writes
+-- the block receipt back. One ticket per voter, and a repeated
+-- Idempotency-Key finds the ticket it created.
+CREATE TABLE IF NOT EXISTS vote_tickets (
+    id               UUID DEFAULT uuid_generate_v4() PRIMARY KEY,
+    idempotency_key  TEXT UNIQUE,
+    voter_id         TEXT UNIQUE NOT NULL REFERENCES voters(voter_id),
+    candidate_name   TEXT NOT NULL,
+    status           TEXT NOT NULL DEFAULT 'pending',  -- pending | committed | rejected
+    receipt          JSONB,
+    error            TEXT,
+    attempts         INTEGER NOT NULL DEFAULT 0,
+    claimed_until    TIMESTAMPTZ,
+    created_at       TIMESTAMPTZ DEFAULT NOW(),
+    updated_at       TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS idx_vote_tickets_pending
+    ON vote_tickets(created_at) WHERE status = 'pending';
+
+ALTER TABLE vote_tickets ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Allow insert vote tickets"
+    ON vote_tickets FOR INSERT
+    WITH CHECK (true);
+
+CREATE POLICY "Allow select vote tickets"
+    ON vote_tickets FOR SELECT
+    USING (true);
+
+-- claim_vote_tickets and finish_vote_tickets run as the API role, so
+-- without this their UPDATEs would match no rows under RLS
+CREATE POLICY "Allow update vote tickets"
+    ON vote_tickets FOR UPDATE
+    USING (true);
+
+-- Lease up to p_limit pending tickets, oldest first. SKIP LOCKED lets
+-- every worker's pipeline claim concurrently without sharing tickets;
+-- a ticket whose lease runs out is claimed again.
+CREATE OR REPLACE FUNCTION claim_vote_tickets(
+    p_limit         INTEGER,
+    p_lease_seconds FLOAT
+)
+RETURNS SETOF vote_tickets
+LANGUAGE sql
+AS $$
+    WITH claimed AS (
+        UPDATE vote_tickets
+        SET claimed_until = NOW() + make_interval(secs => p_lease_seconds),
+            attempts = attempts + 1
+        WHERE id IN (
+            SELECT id FROM vote_tickets
+            WHERE status = 'pending' AND (claimed_until IS NULL OR claimed_until < NOW())
+            ORDER BY created_at
+            LIMIT p_limit
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING *
+    )
+    SELECT * FROM claimed ORDER BY created_at;
+$$;
+
+-- commit_vote for a batch in one round-trip. Each vote is committed or
+-- refused on its own; returns the statuses in input order.
+CREATE OR REPLACE FUNCTION commit_votes(p_votes JSON)
+RETURNS JSON
+LANGUAGE sql
+AS $$
+    SELECT COALESCE(json_agg(
+        commit_vote(v->>'voter_id', v->>'candidate_name', v->>'block_hash',
+                    v->>'previous_hash', (v->>'timestamp')::FLOAT)->>'status'
+        ORDER BY n), '[]'::json)
+    FROM json_array_elements(p_votes) WITH ORDINALITY AS t(v, n);
+$$;
+
+-- Record the outcome of claimed tickets: [{id, status, receipt, error}]
+CREATE OR REPLACE FUNCTION finish_vote_tickets(p_tickets JSON)
+RETURNS VOID
+LANGUAGE sql
+AS $$
+    UPDATE vote_tickets t
+    SET status = f.status, receipt = f.receipt, error = f.error,
+        claimed_until = NULL, updated_at = NOW()
+    FROM json_to_recordset(p_tickets) AS f(id UUID, status TEXT, receipt JSONB, error TEXT)
+    WHERE t.id = f.id;
+$$;
+
 -- ═══════════════════════════════════════════════════════════════════
 -- DONE! Your database is ready.
 -- Next steps: